@@ -0,0 +1,158 @@
+import asyncio
+import math
+import time
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a lane's admission queue is full"""
+
+    def __init__(self, lane, retry_after):
+        super().__init__(f"Admission queue for '{lane}' traffic is full")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded admission queue in front of inference.
+
+    At most `max_concurrency` requests run inference at once. Requests that
+    cannot start immediately wait in their lane's queue; when a lane's queue
+    is at its configured depth new arrivals are rejected straight away
+    instead of piling up on the event loop. Freed slots are always handed to
+    the highest-priority lane first. Priority only orders the queue, so
+    lane_limits caps how many slots a lane may hold at once: with bulk
+    capped below max_concurrency, slow bulk jobs can never occupy every
+    slot and leave interactive requests waiting for one to finish.
+    """
+
+    def __init__(self, max_concurrency=4, lane_depths=None, lane_limits=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # Lanes in priority order (first = highest priority)
+        self.lane_depths = dict(lane_depths or {"interactive": 64, "bulk": 8})
+        self.lanes = list(self.lane_depths)
+        self.max_concurrency = max_concurrency
+        self.lane_limits = {
+            lane: min(max_concurrency, (lane_limits or {}).get(lane) or max_concurrency)
+            for lane in self.lanes
+        }
+
+        self._active = 0
+        self._lane_active = {lane: 0 for lane in self.lanes}
+        self._waiting = {lane: deque() for lane in self.lanes}
+        self._service_time = None  # EWMA of seconds spent holding a slot
+        self._stats = {
+            lane: {"admitted": 0, "rejected": 0, "completed": 0}
+            for lane in self.lanes
+        }
+
+    def queue_depth(self, lane=None):
+        """Number of requests waiting for a slot, in one lane or overall"""
+        if lane is not None:
+            return len(self._waiting[lane])
+        return sum(len(waiters) for waiters in self._waiting.values())
+
+    def retry_after(self):
+        """Estimate in whole seconds until a queued request would be served"""
+        service_time = self._service_time or 1.0
+        backlog = self.queue_depth() + self._active
+        return max(1, math.ceil(backlog * service_time / self.max_concurrency))
+
+    @asynccontextmanager
+    async def admit(self, lane="interactive"):
+        """
+        Hold an inference slot for the duration of the block.
+
+        Raises AdmissionRejected without waiting when the lane's queue is full.
+        """
+        if lane not in self._waiting:
+            raise ValueError(f"Unknown admission lane: {lane}")
+
+        if self._has_slot(lane) and not self._has_priority_waiters(lane):
+            self._take(lane)
+        else:
+            if len(self._waiting[lane]) >= self.lane_depths[lane]:
+                self._stats[lane]["rejected"] += 1
+                raise AdmissionRejected(lane, self.retry_after())
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiting[lane].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    self._release(lane)
+                else:
+                    self._waiting[lane].remove(waiter)
+                raise
+
+        self._stats[lane]["admitted"] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_service_time(time.perf_counter() - start)
+            self._stats[lane]["completed"] += 1
+            self._release(lane)
+
+    def _has_slot(self, lane):
+        return (self._active < self.max_concurrency
+                and self._lane_active[lane] < self.lane_limits[lane])
+
+    def _take(self, lane):
+        self._active += 1
+        self._lane_active[lane] += 1
+
+    def _has_priority_waiters(self, lane):
+        """Whether this lane or a higher-priority one already has waiters"""
+        for other in self.lanes:
+            if self._waiting[other]:
+                return True
+            if other == lane:
+                return False
+        return False
+
+    def _release(self, lane):
+        """Free a slot of `lane` and hand it to the highest-priority waiter that may take it"""
+        self._active -= 1
+        self._lane_active[lane] -= 1
+        for other in self.lanes:
+            waiters = self._waiting[other]
+            while waiters and self._has_slot(other):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._take(other)
+                    waiter.set_result(None)
+                    return
+
+    def _record_service_time(self, elapsed):
+        if self._service_time is None:
+            self._service_time = elapsed
+        else:
+            self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+
+    def stats(self):
+        """Snapshot of slot usage, queue depths and per-lane counters"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "lanes": {
+                lane: {
+                    "active": self._lane_active[lane],
+                    "max_active": self.lane_limits[lane],
+                    "queue_depth": len(self._waiting[lane]),
+                    "max_queue_depth": self.lane_depths[lane],
+                    **self._stats[lane],
+                }
+                for lane in self.lanes
+            },
+            "avg_service_ms": round((self._service_time or 0.0) * 1000, 3),
+        }
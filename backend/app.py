@@ -1,13 +1,30 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, model_validator
 import joblib
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional
+import asyncio
+import hashlib
+import json
 import logging
+import time
 from datetime import datetime
 
-from ml_pipeline import NewsClassifier, preprocess_text
+from ml_pipeline import NewsClassifier
+from admission import AdmissionController, AdmissionRejected
+from audit import AuditSink
+from monitoring import DriftMonitor
+from shadow import ShadowEvaluator
+from registry import ModelNotFound, ModelRegistry
+from deadlines import ClientDisconnected, DeadlineExceeded, RequestDeadline
+from similarity import SimilarityIndex
+from coalescing import SingleFlight
+from streaming import StreamingSession
+from degradation import TierGovernor
+import columnar
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,11 +43,91 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Serving configuration
+MODEL_PRECISION = os.environ.get("NEWS_CLASSIFIER_PRECISION", "float64")
+MAX_CONCURRENCY = int(os.environ.get("NEWS_CLASSIFIER_MAX_CONCURRENCY", "4"))
+INTERACTIVE_QUEUE_DEPTH = int(
+    os.environ.get("NEWS_CLASSIFIER_INTERACTIVE_QUEUE_DEPTH", "64"))
+BULK_QUEUE_DEPTH = int(os.environ.get("NEWS_CLASSIFIER_BULK_QUEUE_DEPTH", "8"))
+# Slots bulk jobs may hold at once; the rest stay free for interactive requests
+BULK_MAX_CONCURRENCY = int(os.environ.get(
+    "NEWS_CLASSIFIER_BULK_MAX_CONCURRENCY", str(max(1, MAX_CONCURRENCY - 1))))
+MAX_BATCH_SIZE = int(os.environ.get("NEWS_CLASSIFIER_MAX_BATCH_SIZE", "256"))
+MAX_ARROW_ROWS = int(os.environ.get("NEWS_CLASSIFIER_MAX_ARROW_ROWS", "10000"))
+WARMUP_ROUNDS = int(os.environ.get("NEWS_CLASSIFIER_WARMUP_ROUNDS", "3"))
+AUDIT_DB = os.environ.get("NEWS_CLASSIFIER_AUDIT_DB", "")
+AUDIT_QUEUE_SIZE = int(os.environ.get("NEWS_CLASSIFIER_AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_SHUTDOWN_POLICY = os.environ.get("NEWS_CLASSIFIER_AUDIT_SHUTDOWN_POLICY", "flush")
+DRIFT_MONITORING = os.environ.get("NEWS_CLASSIFIER_DRIFT_MONITORING", "1") == "1"
+# Default time budget per inference request and lane; 0 disables it
+REQUEST_TIMEOUT_MS = {
+    "interactive": float(os.environ.get("NEWS_CLASSIFIER_REQUEST_TIMEOUT_MS", "10000")),
+    "bulk": float(os.environ.get("NEWS_CLASSIFIER_BULK_REQUEST_TIMEOUT_MS", "120000")),
+}
+# Cheaper preprocessing tiers under overload
+DEGRADE_PREPROCESSING = os.environ.get("NEWS_CLASSIFIER_DEGRADE_PREPROCESSING", "1") == "1"
+DEGRADE_QUEUE_DEPTH = int(os.environ.get("NEWS_CLASSIFIER_DEGRADE_QUEUE_DEPTH", "16"))
+DEGRADE_LATENCY_MS = float(os.environ.get("NEWS_CLASSIFIER_DEGRADE_LATENCY_MS", "500"))
+COALESCE_REQUESTS = os.environ.get("NEWS_CLASSIFIER_COALESCE_REQUESTS", "1") == "1"
+STREAM_MAX_CHARS = int(os.environ.get("NEWS_CLASSIFIER_STREAM_MAX_CHARS", "1000000"))
+SIMILARITY_INDEX = os.environ.get("NEWS_CLASSIFIER_SIMILARITY_INDEX", "1") == "1"
+SIMILARITY_MAX_ARTICLES = int(os.environ.get("NEWS_CLASSIFIER_SIMILARITY_MAX_ARTICLES", "50000"))
+SIMILARITY_MEMORY_MB = float(os.environ.get("NEWS_CLASSIFIER_SIMILARITY_MEMORY_MB", "64"))
+TRAINING_DATA = os.environ.get("NEWS_CLASSIFIER_TRAINING_DATA", "")
+TRAINING_TABLE = os.environ.get("NEWS_CLASSIFIER_TRAINING_TABLE", "articles")
+MAX_MODELS = int(os.environ.get("NEWS_CLASSIFIER_MAX_MODELS", "4"))
+MODEL_MEMORY_MB = os.environ.get("NEWS_CLASSIFIER_MODEL_MEMORY_MB", "")
+SHADOW_MODEL = os.environ.get("NEWS_CLASSIFIER_SHADOW_MODEL", "")
+SHADOW_SAMPLE_RATE = float(os.environ.get("NEWS_CLASSIFIER_SHADOW_SAMPLE_RATE", "0.1"))
+# Clients and proxies may reuse a cached response but must revalidate it
+CACHE_CONTROL = os.environ.get("NEWS_CLASSIFIER_CACHE_CONTROL", "private, no-cache")
+
 # Global classifier instance
 classifier = None
 
+# Named model variants, loaded on first use
+registry = None
+
+# Readiness state; only "ready" once the model is loaded and warmed up
+readiness = {"phase": "starting", "ready": False, "warmup_seconds": None, "error": None}
+startup_task = None
+
+# Optional write-behind audit log of every verdict
+audit_sink = None
+
+# Optional candidate model scored on sampled /classify traffic
+shadow = None
+
+# Only one /train runs at a time
+training_lock = asyncio.Lock()
+
+# Identical /classify requests in flight share one computation
+coalescer = SingleFlight() if COALESCE_REQUESTS else None
+
+# WebSocket scoring sessions
+stream_stats = {"active": 0, "sessions": 0, "fragments": 0}
+
+# Recent /classify articles for similar-article search
+similarity_index = None
+
+# Requests abandoned before their work finished
+abandoned_requests = {"deadline_exceeded": 0, "client_disconnected": 0}
+
+# Admission control in front of inference; interactive traffic has priority
+admission = AdmissionController(
+    max_concurrency=MAX_CONCURRENCY,
+    lane_depths={"interactive": INTERACTIVE_QUEUE_DEPTH, "bulk": BULK_QUEUE_DEPTH},
+    lane_limits={"bulk": BULK_MAX_CONCURRENCY}
+)
+
+# Preprocessing tier for new requests, from interactive queue depth and latency
+governor = TierGovernor(
+    admission, queue_depth=DEGRADE_QUEUE_DEPTH, latency_ms=DEGRADE_LATENCY_MS
+) if DEGRADE_PREPROCESSING else None
+
 
 class NewsArticle(BaseModel):
     title: str
@@ -43,33 +140,317 @@ class ClassificationResponse(BaseModel):
     probability_fake: float
     probability_real: float
     processed_text_length: int
+    preprocessing_tier: str = "full"
     timestamp: str
 
 
+class BatchClassificationRequest(BaseModel):
+    articles: List[NewsArticle]
+
+
+class BatchClassificationResult(BaseModel):
+    prediction: str
+    confidence: float
+    probability_fake: float
+    probability_real: float
+
+
+class BatchClassificationResponse(BaseModel):
+    results: List[BatchClassificationResult]
+    preprocessing_tier: str = "full"
+    timestamp: str
+
+
+class ExplanationRequest(NewsArticle):
+    top_k: int = Field(default=10, ge=1, le=100)
+
+
+class TermContribution(BaseModel):
+    term: str
+    weight: float
+
+
+class ExplanationResponse(BaseModel):
+    prediction: str
+    confidence: float
+    probability_fake: float
+    probability_real: float
+    top_fake_terms: List[TermContribution]
+    top_real_terms: List[TermContribution]
+    preprocessing_tier: str = "full"
+    timestamp: str
+
+
+class SimilarRequest(BaseModel):
+    title: str
+    content: str
+    top_k: int = Field(default=10, ge=1, le=100)
+
+
+class SimilarArticle(BaseModel):
+    id: int
+    title: str
+    snippet: str
+    prediction: str
+    confidence: float
+    classified_at: str
+    similarity: float
+
+
+class SimilarResponse(BaseModel):
+    results: List[SimilarArticle]
+    indexed_articles: int
+    timestamp: str
+
+
+class ShadowRequest(BaseModel):
+    model_path: str
+    sample_rate: float = Field(default=SHADOW_SAMPLE_RATE, ge=0.0, le=1.0)
+
+
 class TrainingRequest(BaseModel):
     retrain: bool = False
+    vectorizer_type: Literal["tfidf", "hashing"] = "tfidf"
+    prune_features: Optional[int] = Field(default=None, ge=1)
+    prune_method: Literal["coef", "chi2"] = "coef"
+    profile_memory: bool = False
+
+    @model_validator(mode="after")
+    def check_pruning(self):
+        if self.prune_features is not None and self.vectorizer_type != "tfidf":
+            raise ValueError("prune_features requires vectorizer_type 'tfidf'")
+        return self
+
+
+def too_busy(rejection):
+    """Fast 429 response for a full admission queue"""
+    return HTTPException(
+        status_code=429,
+        detail=str(rejection),
+        headers={"Retry-After": str(rejection.retry_after)}
+    )
+
+
+def prepare_model():
+    """Load or train the model, then warm it up (runs in a worker thread)"""
+    # Check if model exists, if not train it
+    if not os.path.exists(classifier.model_path):
+        readiness["phase"] = "training"
+        logger.info("No existing model found. Training new model...")
+        classifier.train_model()
+        logger.info("Model training completed!")
+    else:
+        readiness["phase"] = "loading"
+        logger.info("Loading existing model...")
+        classifier.load_model()
+        logger.info("Model loaded successfully!")
+
+    readiness["phase"] = "warming_up"
+    readiness["warmup_seconds"] = round(classifier.warm_up(rounds=WARMUP_ROUNDS), 3)
+
+    # Attached after warm-up, so its sample articles don't count as traffic
+    if DRIFT_MONITORING:
+        classifier.monitor = DriftMonitor()
+
+
+async def initialize_model():
+    """Bring the model to a ready state without blocking server startup"""
+    try:
+        await run_in_threadpool(prepare_model)
+        readiness["phase"] = "ready"
+        readiness["ready"] = True
+        logger.info("Classifier is warm and ready for traffic")
+    except Exception as e:
+        readiness["phase"] = "failed"
+        readiness["error"] = str(e)
+        logger.error(f"Error during startup: {str(e)}")
+        return
+
+    if SHADOW_MODEL:
+        try:
+            await start_shadow(SHADOW_MODEL, SHADOW_SAMPLE_RATE)
+        except Exception as e:
+            logger.error(f"Error loading shadow model: {str(e)}")
+
+
+def load_candidate(model_path):
+    """Load and warm up a candidate model (runs in a worker thread)"""
+    candidate = NewsClassifier(precision=MODEL_PRECISION, model_path=model_path)
+    if not candidate.load_model():
+        raise FileNotFoundError(f"No saved model at {model_path}")
+    candidate.warm_up(rounds=1)
+    return candidate
+
+
+async def start_shadow(model_path, sample_rate):
+    """Replace the shadow evaluator with one for the given candidate"""
+    global shadow
+    candidate = await run_in_threadpool(load_candidate, model_path)
+    evaluator = ShadowEvaluator(candidate, sample_rate=sample_rate)
+    evaluator.start()
+
+    previous, shadow = shadow, evaluator
+    if previous:
+        await run_in_threadpool(previous.close)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the ML model on startup"""
-    global classifier
+    global classifier, registry, startup_task, audit_sink, similarity_index
+    classifier = NewsClassifier(precision=MODEL_PRECISION,
+                                data_source=TRAINING_DATA or None,
+                                data_table=TRAINING_TABLE)
+    registry = ModelRegistry(
+        os.path.dirname(classifier.model_path) or ".",
+        precision=MODEL_PRECISION,
+        max_models=MAX_MODELS,
+        max_bytes=int(float(MODEL_MEMORY_MB) * 1024 * 1024) if MODEL_MEMORY_MB else None
+    )
+    if AUDIT_DB:
+        audit_sink = AuditSink(
+            AUDIT_DB,
+            max_queue=AUDIT_QUEUE_SIZE,
+            shutdown_policy=AUDIT_SHUTDOWN_POLICY
+        )
+        audit_sink.start()
+
+    if SIMILARITY_INDEX:
+        similarity_index = SimilarityIndex(
+            max_articles=SIMILARITY_MAX_ARTICLES,
+            max_bytes=int(SIMILARITY_MEMORY_MB * 1024 * 1024)
+        )
+
+    # Loading, training and warm-up happen in the background; /ready
+    # reports when the instance can take traffic
+    startup_task = asyncio.create_task(initialize_model())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush or drop pending audit records according to the configured policy"""
+    if audit_sink:
+        await run_in_threadpool(audit_sink.close)
+    if shadow:
+        await run_in_threadpool(shadow.close)
+
+
+def make_etag(*parts):
+    """Strong ETag over the model version and the request's input"""
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag):
+    """Whether the request's If-None-Match header already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # "*" only short-circuits GET/HEAD: on POST /classify it would answer any
+    # article with an empty 304 (RFC 9110 wants 412 there), so it is ignored
+    if "*" in candidates and request.method in ("GET", "HEAD"):
+        return True
+    # Weak comparison, as RFC 9110 specifies for If-None-Match
+    return etag in [
+        candidate[2:] if candidate.startswith("W/") else candidate
+        for candidate in candidates
+    ]
+
+
+def not_modified(etag):
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def request_deadline(request, lane):
+    """Deadline of an inference request from its header or the lane's default"""
     try:
-        classifier = NewsClassifier()
+        return RequestDeadline.from_request(request, default_ms=REQUEST_TIMEOUT_MS[lane])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def abandoned(error):
+    """Fast error response for a request whose work was abandoned"""
+    if isinstance(error, ClientDisconnected):
+        abandoned_requests["client_disconnected"] += 1
+        # Nobody is listening; 499 only shows up in access logs
+        return HTTPException(status_code=499, detail=str(error))
+    abandoned_requests["deadline_exceeded"] += 1
+    return HTTPException(status_code=504, detail=str(error))
+
+
+def model_ready():
+    """
+    Whether the serving classifier can score requests. Training assigns
+    classifier.model before fitting it; model_version is only set once
+    the fitted pipeline is installed.
+    """
+    return bool(classifier and classifier.pipeline is not None and classifier.model_version)
+
+
+async def resolve_model(name):
+    """The serving classifier, or the named variant from the registry"""
+    if name is None:
+        if not model_ready():
+            raise HTTPException(status_code=503, detail="Model not loaded")
+        return classifier
 
-        # Check if model exists, if not train it
-        if not os.path.exists("models/news_classifier.joblib"):
-            logger.info("No existing model found. Training new model...")
-            classifier.train_model()
-            logger.info("Model training completed!")
-        else:
-            logger.info("Loading existing model...")
-            classifier.load_model()
-            logger.info("Model loaded successfully!")
+    if not registry:
+        raise HTTPException(status_code=503, detail="Model registry not initialized")
+    try:
+        return await run_in_threadpool(registry.get, name)
+    except ModelNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
-        raise
+
+def serving_tier():
+    """
+    Preprocessing tier for a request that was just admitted; chosen then
+    rather than on arrival, so a burst sees the queue it built up
+    """
+    return governor.tier() if governor else "full"
+
+
+def classification_etag(model, full_text, tier):
+    """ETag of a /classify verdict; full-tier ETags don't name the tier"""
+    if tier == "full":
+        return make_etag(model.model_version, full_text)
+    return make_etag(model.model_version, tier, full_text)
+
+
+def observe_latency(started):
+    """Feed an interactive request's latency to the tier governor"""
+    if governor:
+        governor.observe((time.perf_counter() - started) * 1000)
+
+
+def classify_and_index(model, article, full_text, should_stop, tier="full"):
+    """Score an article and add the serving model's vector to the similarity index"""
+    prediction, confidence, probabilities, token_count, features = \
+        model.predict_with_features(full_text, should_stop, tier)
+    # Only full-tier vectors are indexed, so the index matches /similar queries
+    if similarity_index and model is classifier and features is not None and tier == "full":
+        similarity_index.add(features, model.model_version, article.title, article.content,
+                             prediction, confidence)
+    return prediction, confidence, probabilities, token_count
+
+
+def find_similar(text, top_k):
+    """Vectorize an article with the serving model and search the index"""
+    features = classifier.vectorize(text)
+    if features is None:
+        return []
+    return similarity_index.query(features, classifier.model_version, top_k=top_k)
+
+
+def audit(endpoint, text, prediction, probabilities, started, model=None):
+    """Queue a verdict for the audit log if one is configured"""
+    if audit_sink:
+        audit_sink.record(
+            endpoint, text, (model or classifier).model_version, prediction, probabilities,
+            (time.perf_counter() - started) * 1000
+        )
 
 
 @app.get("/")
@@ -85,7 +466,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
-    model_status = "loaded" if classifier and classifier.model else "not_loaded"
+    model_status = "loaded" if model_ready() else "not_loaded"
     return {
         "status": "healthy",
         "model_status": model_status,
@@ -93,49 +474,401 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe; 503 until the model is loaded and warmed up"""
+    body = {**readiness, "timestamp": datetime.now().isoformat()}
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
 @app.post("/classify", response_model=ClassificationResponse)
-async def classify_news(article: NewsArticle):
+async def classify_news(article: NewsArticle, request: Request, response: Response,
+                        model_name: Optional[str] = Query(default=None, alias="model")):
     """Classify a news article as real or fake"""
+    started = time.perf_counter()
     try:
-        if not classifier or not classifier.model:
-            raise HTTPException(status_code=503, detail="Model not loaded")
+        deadline = request_deadline(request, "interactive")
+        model = await resolve_model(model_name)
 
         # Combine title and content
         full_text = f"{article.title} {article.content}"
 
-        # Get prediction
-        prediction, confidence, probabilities = classifier.predict(full_text)
+        # The verdict only depends on the model, the preprocessing tier and
+        # the text, so a client holding the current ETag already has it. A
+        # degraded verdict only stays valid while the server is degraded.
+        current_tier = governor.current() if governor else "full"
+        for etag in {classification_etag(model, full_text, "full"),
+                     classification_etag(model, full_text, current_tier)}:
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        # Run inference off the event loop once admitted; `job` is this
+        # request's deadline, or the flight shared with identical requests
+        async def infer(job, should_stop):
+            async with admission.admit("interactive"):
+                job.started = True
+                tier = serving_tier()
+                # Get prediction and the processed length in one preprocessing pass
+                inference_started = time.perf_counter()
+                result = await run_in_threadpool(
+                    classify_and_index, model, article, full_text, should_stop, tier)
+                return result, tier, (time.perf_counter() - inference_started) * 1000
+
+        if coalescer:
+            key = (model.model_version, article.title, article.content)
+
+            async def work():
+                return await coalescer.do(key, lambda flight: infer(flight, flight.abandoned))
+        else:
+            async def work():
+                return await infer(deadline, deadline.should_stop)
+
+        (prediction, confidence, probabilities, token_count), tier, inference_ms = \
+            await deadline.run(request, work)
+        response.headers["ETag"] = classification_etag(model, full_text, tier)
+        response.headers["Cache-Control"] = CACHE_CONTROL
 
-        # Process text to get length info
-        processed_text = preprocess_text(full_text)
+        audit("/classify", full_text, prediction, probabilities, started, model)
+        if shadow and model is classifier and tier == "full":
+            shadow.offer(full_text, prediction, probabilities, inference_ms)
+        observe_latency(started)
 
         return ClassificationResponse(
             prediction=prediction,
             confidence=confidence,
             probability_fake=probabilities[0],
             probability_real=probabilities[1],
-            processed_text_length=len(processed_text.split()),
+            processed_text_length=token_count,
+            preprocessing_tier=tier,
             timestamp=datetime.now().isoformat()
         )
 
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    except (DeadlineExceeded, ClientDisconnected) as e:
+        raise abandoned(e)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during classification: {str(e)}")
         raise HTTPException(
             status_code=500, detail=f"Classification error: {str(e)}")
 
 
+@app.post("/classify/batch", response_model=BatchClassificationResponse)
+async def classify_news_batch(request: BatchClassificationRequest, http_request: Request,
+                              model_name: Optional[str] = Query(default=None, alias="model")):
+    """Classify a batch of news articles in the bulk admission lane"""
+    started = time.perf_counter()
+    try:
+        deadline = request_deadline(http_request, "bulk")
+        model = await resolve_model(model_name)
+
+        if not request.articles:
+            raise HTTPException(status_code=422, detail="No articles provided")
+
+        if len(request.articles) > MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch size exceeds the limit of {MAX_BATCH_SIZE} articles")
+
+        texts = [f"{article.title} {article.content}" for article in request.articles]
+
+        async def infer():
+            async with admission.admit("bulk"):
+                deadline.started = True
+                tier = serving_tier()
+                return await run_in_threadpool(
+                    model.predict_batch, texts, deadline.should_stop, tier), tier
+
+        predictions, tier = await deadline.run(http_request, infer)
+
+        for text, (prediction, _, probabilities) in zip(texts, predictions):
+            audit("/classify/batch", text, prediction, probabilities, started, model)
+
+        return BatchClassificationResponse(
+            results=[
+                BatchClassificationResult(
+                    prediction=prediction,
+                    confidence=confidence,
+                    probability_fake=probabilities[0],
+                    probability_real=probabilities[1]
+                )
+                for prediction, confidence, probabilities in predictions
+            ],
+            preprocessing_tier=tier,
+            timestamp=datetime.now().isoformat()
+        )
+
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    except (DeadlineExceeded, ClientDisconnected) as e:
+        raise abandoned(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during batch classification: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Classification error: {str(e)}")
+
+
+@app.post("/classify/arrow")
+async def classify_news_arrow(request: Request,
+                              model_name: Optional[str] = Query(default=None, alias="model")):
+    """
+    Classify an Arrow IPC stream or Parquet file of articles with title and
+    content columns; responds with an Arrow IPC stream of predictions
+    """
+    started = time.perf_counter()
+    try:
+        deadline = request_deadline(request, "bulk")
+        model = await resolve_model(model_name)
+
+        if columnar.pa is None:
+            raise HTTPException(status_code=501, detail="pyarrow is not installed")
+
+        media_type = request.headers.get(
+            "content-type", columnar.ARROW_STREAM_MEDIA_TYPE).split(";")[0].strip()
+        if media_type not in (columnar.ARROW_STREAM_MEDIA_TYPE, *columnar.PARQUET_MEDIA_TYPES):
+            raise HTTPException(status_code=415, detail=f"Unsupported media type: {media_type}")
+
+        body = await request.body()
+        try:
+            table = await run_in_threadpool(
+                columnar.read_articles, body, media_type, MAX_ARROW_ROWS)
+        except columnar.TableTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except (ValueError, columnar.pa.ArrowException) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid article table: {str(e)}")
+
+        if table.num_rows == 0:
+            raise HTTPException(status_code=422, detail="No articles provided")
+
+        texts = columnar.article_texts(table)
+
+        async def infer():
+            async with admission.admit("bulk"):
+                deadline.started = True
+                tier = serving_tier()
+                return await run_in_threadpool(
+                    model.predict_batch_arrays, texts, deadline.should_stop, tier), tier
+
+        (labels, probabilities), tier = await deadline.run(request, infer)
+
+        for text, prediction, probs in zip(texts, labels, probabilities):
+            audit("/classify/arrow", text, prediction, probs, started, model)
+
+        batch = columnar.predictions_batch(labels, probabilities, model.model_version, tier)
+        return Response(content=columnar.write_stream(batch),
+                        media_type=columnar.ARROW_STREAM_MEDIA_TYPE)
+
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    except (DeadlineExceeded, ClientDisconnected) as e:
+        raise abandoned(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during columnar classification: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Classification error: {str(e)}")
+
+
+@app.post("/explain", response_model=ExplanationResponse)
+async def explain_news(request: ExplanationRequest, http_request: Request,
+                       model_name: Optional[str] = Query(default=None, alias="model")):
+    """Explain which terms push an article towards fake or real"""
+    started = time.perf_counter()
+    try:
+        deadline = request_deadline(http_request, "interactive")
+        model = await resolve_model(model_name)
+
+        # Combine title and content
+        full_text = f"{request.title} {request.content}"
+
+        async def infer():
+            async with admission.admit("interactive"):
+                deadline.started = True
+                tier = serving_tier()
+                return await run_in_threadpool(
+                    model.explain, full_text, request.top_k, deadline.should_stop, tier), tier
+
+        (prediction, confidence, probabilities, fake_terms, real_terms), tier = \
+            await deadline.run(http_request, infer)
+
+        audit("/explain", full_text, prediction, probabilities, started, model)
+        observe_latency(started)
+
+        return ExplanationResponse(
+            prediction=prediction,
+            confidence=confidence,
+            probability_fake=probabilities[0],
+            probability_real=probabilities[1],
+            top_fake_terms=fake_terms,
+            top_real_terms=real_terms,
+            preprocessing_tier=tier,
+            timestamp=datetime.now().isoformat()
+        )
+
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    except (DeadlineExceeded, ClientDisconnected) as e:
+        raise abandoned(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during explanation: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Explanation error: {str(e)}")
+
+
+@app.websocket("/ws/classify")
+async def classify_stream(websocket: WebSocket,
+                          model_name: Optional[str] = Query(default=None, alias="model")):
+    """
+    Score an article as it arrives: each {"fragment": "...", "final": false}
+    message is answered with the verdict for all text received so far. A
+    message with "final": true also scores any held-back partial word, and
+    ends the session.
+    """
+    await websocket.accept()
+    try:
+        model = await resolve_model(model_name)
+    except HTTPException as e:
+        await websocket.send_json({"error": e.detail, "status": e.status_code})
+        await websocket.close(code=1008 if e.status_code == 404 else 1013)
+        return
+
+    session = StreamingSession(model)
+    stream_stats["active"] += 1
+    stream_stats["sessions"] += 1
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                fragment = message.get("fragment", "")
+                final = bool(message.get("final", False))
+                if not isinstance(fragment, str):
+                    raise ValueError("fragment must be a string")
+            except (ValueError, AttributeError) as e:
+                await websocket.send_json({"error": f"Invalid message: {str(e)}", "status": 422})
+                continue
+
+            if session.chars + len(fragment) > STREAM_MAX_CHARS:
+                await websocket.send_json({
+                    "error": f"Stream exceeds the limit of {STREAM_MAX_CHARS} characters",
+                    "status": 413
+                })
+                await websocket.close(code=1009)
+                return
+
+            def score():
+                result = session.feed(fragment)
+                return session.finish() if final else result
+
+            try:
+                async with admission.admit("interactive"):
+                    prediction, confidence, probabilities, token_count = \
+                        await run_in_threadpool(score)
+            except AdmissionRejected as e:
+                # The fragment was not applied; the client may resend it
+                await websocket.send_json({
+                    "error": str(e), "status": 429, "retry_after": e.retry_after})
+                continue
+
+            stream_stats["fragments"] += 1
+            await websocket.send_json({
+                "prediction": prediction,
+                "confidence": confidence,
+                "probability_fake": probabilities[0],
+                "probability_real": probabilities[1],
+                "processed_text_length": token_count,
+                "fragments": session.fragments,
+                "final": final,
+                "incremental": session.incremental,
+                "model_version": session.model_version,
+                "timestamp": datetime.now().isoformat()
+            })
+            if final:
+                await websocket.close(code=1000)
+                return
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error during stream classification: {str(e)}")
+        await websocket.close(code=1011)
+    finally:
+        stream_stats["active"] -= 1
+
+
+@app.post("/similar", response_model=SimilarResponse)
+async def similar_articles(request: SimilarRequest, http_request: Request):
+    """Previously classified articles most similar to the given one"""
+    try:
+        if not similarity_index:
+            raise HTTPException(status_code=404, detail="Similarity index is disabled")
+
+        deadline = request_deadline(http_request, "interactive")
+        await resolve_model(None)
+
+        # Combine title and content
+        full_text = f"{request.title} {request.content}"
+
+        async def search():
+            async with admission.admit("interactive"):
+                deadline.started = True
+                return await run_in_threadpool(find_similar, full_text, request.top_k)
+
+        matches = await deadline.run(http_request, search)
+
+        return SimilarResponse(
+            results=[SimilarArticle(**meta, similarity=score) for score, meta in matches],
+            indexed_articles=similarity_index.stats()["articles"],
+            timestamp=datetime.now().isoformat()
+        )
+
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    except (DeadlineExceeded, ClientDisconnected) as e:
+        raise abandoned(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during similarity search: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Similarity error: {str(e)}")
+
+
 @app.post("/train")
 async def train_model(request: TrainingRequest):
     """Train or retrain the model"""
     try:
         global classifier
 
-        if not classifier:
-            classifier = NewsClassifier()
-
-        logger.info("Starting model training...")
-        metrics = classifier.train_model(retrain=request.retrain)
-        logger.info("Model training completed!")
+        if training_lock.locked():
+            raise HTTPException(status_code=409, detail="Training already in progress")
+
+        async with training_lock:
+            # Train a separate classifier off the event loop and swap it in
+            # when done; requests in flight keep the model they started with
+            candidate = NewsClassifier(precision=MODEL_PRECISION,
+                                       data_source=TRAINING_DATA or None,
+                                       data_table=TRAINING_TABLE)
+            logger.info("Starting model training...")
+            metrics = await run_in_threadpool(
+                candidate.train_model,
+                retrain=request.retrain, vectorizer_type=request.vectorizer_type,
+                prune_features=request.prune_features, prune_method=request.prune_method,
+                profile_memory=request.profile_memory)
+            await run_in_threadpool(candidate.warm_up, 1)
+
+            candidate.monitor = classifier.monitor if classifier else (
+                DriftMonitor() if DRIFT_MONITORING else None)
+            classifier = candidate
+            logger.info("Model training completed!")
 
         return {
             "message": "Model trained successfully",
@@ -143,19 +876,127 @@ async def train_model(request: TrainingRequest):
             "timestamp": datetime.now().isoformat()
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during training: {str(e)}")
         raise HTTPException(
             status_code=500, detail=f"Training error: {str(e)}")
 
 
+@app.get("/stats")
+async def get_stats():
+    """Runtime serving statistics"""
+    return {
+        "admission": admission.stats(),
+        "abandoned_requests": dict(abandoned_requests),
+        "coalescing": coalescer.stats() if coalescer else None,
+        "streaming": dict(stream_stats),
+        "preprocessing": governor.stats() if governor else None,
+        "similarity_index": similarity_index.stats() if similarity_index else None,
+        "audit": audit_sink.stats() if audit_sink else None,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/monitoring/drift")
+async def get_drift_monitoring():
+    """Streaming drift statistics of live traffic against the training vocabulary"""
+    if not classifier or not classifier.monitor:
+        raise HTTPException(status_code=404, detail="Drift monitoring is disabled")
+
+    vocabulary = getattr(classifier.vectorizer, 'vocabulary_', None)
+    return {
+        **classifier.monitor.snapshot(vocabulary=vocabulary, model_version=classifier.model_version),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/shadow")
+async def get_shadow_stats():
+    """Agreement and latency of the candidate model against the serving one"""
+    if not shadow:
+        raise HTTPException(status_code=404, detail="No shadow model loaded")
+    return {
+        "serving_model_version": classifier.model_version if classifier else None,
+        **shadow.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/shadow")
+async def load_shadow_model(request: ShadowRequest):
+    """Load a candidate model from the models directory for shadow evaluation"""
+    try:
+        if not model_ready():
+            raise HTTPException(status_code=503, detail="Model not loaded")
+
+        # Only artifacts beside the serving model may be loaded
+        models_dir = os.path.realpath(os.path.dirname(classifier.model_path) or ".")
+        model_path = os.path.realpath(os.path.join(models_dir, request.model_path))
+        if os.path.dirname(model_path) != models_dir:
+            raise HTTPException(status_code=400,
+                                detail="Candidate model must be in the models directory")
+        if not os.path.exists(model_path):
+            raise HTTPException(status_code=404, detail="Candidate model not found")
+
+        await start_shadow(model_path, request.sample_rate)
+        return {
+            "message": "Shadow evaluation started",
+            "candidate_model_version": shadow.candidate.model_version,
+            "sample_rate": shadow.sample_rate,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error loading shadow model: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@app.delete("/shadow")
+async def stop_shadow_evaluation():
+    """Stop shadow evaluation and unload the candidate"""
+    global shadow
+    if not shadow:
+        raise HTTPException(status_code=404, detail="No shadow model loaded")
+
+    previous, shadow = shadow, None
+    await run_in_threadpool(previous.close)
+    return {
+        "message": "Shadow evaluation stopped",
+        "stats": previous.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/models")
+async def list_models():
+    """Named model variants with their load times, hit counts and LRU state"""
+    if not registry:
+        raise HTTPException(status_code=503, detail="Model registry not initialized")
+    return {
+        "available": registry.available(),
+        **registry.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @app.get("/model-info")
-async def get_model_info():
+async def get_model_info(request: Request, response: Response):
     """Get information about the current model"""
     try:
         if not classifier:
             return {"status": "No classifier initialized"}
 
+        if classifier.model_version:
+            etag = make_etag(classifier.model_version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = CACHE_CONTROL
+
         info = classifier.get_model_info()
         return info
 
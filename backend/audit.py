@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream for the writer thread
+_STOP = object()
+
+
+class AuditSink:
+    """
+    Write-behind prediction audit log backed by SQLite.
+
+    Request handlers call record(), which only hashes the input and puts a
+    small tuple on a bounded queue. A background thread drains the queue and
+    writes records in batched transactions, so no request ever waits on
+    disk. When the queue is full new records are dropped and counted rather
+    than blocking the request.
+
+    On close() the "flush" policy writes everything still queued (bounded by
+    shutdown_timeout); the "drop" policy discards the backlog and only
+    finishes the batch in progress.
+    """
+
+    def __init__(self, db_path, max_queue=10000, batch_size=256, flush_interval=1.0,
+                 shutdown_policy="flush", shutdown_timeout=5.0):
+        if shutdown_policy not in ("flush", "drop"):
+            raise ValueError(f"Unsupported shutdown policy: {shutdown_policy}")
+
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.shutdown_policy = shutdown_policy
+        self.shutdown_timeout = shutdown_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "dropped": 0, "written": 0, "batches": 0,
+                       "write_errors": 0}
+
+    def start(self):
+        """Create the table and start the writer thread"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS predictions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    input_hash TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    prediction TEXT NOT NULL,
+                    probability_fake REAL NOT NULL,
+                    probability_real REAL NOT NULL,
+                    latency_ms REAL NOT NULL
+                )
+                """
+            )
+        self._thread.start()
+        logger.info(f"Audit log writing to {self.db_path}")
+
+    def record(self, endpoint, text, model_version, prediction, probabilities, latency_ms):
+        """Queue one verdict for writing; never blocks the caller"""
+        entry = (
+            datetime.now().isoformat(),
+            endpoint,
+            hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            model_version,
+            prediction,
+            float(probabilities[0]),
+            float(probabilities[1]),
+            float(latency_ms),
+        )
+        try:
+            self._queue.put_nowait(entry)
+            self._count("enqueued")
+        except queue.Full:
+            self._count("dropped")
+
+    def close(self):
+        """Stop the writer according to the shutdown policy"""
+        if not self._thread.is_alive():
+            return
+
+        if self.shutdown_policy == "drop":
+            discarded = 0
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    discarded += 1
+                except queue.Empty:
+                    break
+            self._count("dropped", discarded)
+
+        try:
+            self._queue.put(_STOP, timeout=self.shutdown_timeout)
+        except queue.Full:
+            logger.warning("Audit queue still full at shutdown; stopping without flush")
+        self._thread.join(timeout=self.shutdown_timeout)
+
+        if self._thread.is_alive():
+            logger.warning("Audit writer did not finish within the shutdown timeout")
+        logger.info(f"Audit log closed: {self.stats()}")
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["shutdown_policy"] = self.shutdown_policy
+        return stats
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _run(self):
+        """Writer thread: batch queued records into single transactions"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        stopping = False
+        while not stopping:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                # Keep filling the batch until it is full or the interval ends
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(conn, batch)
+
+        conn.close()
+
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO predictions (created_at, endpoint, input_hash, model_version, "
+                    "prediction, probability_fake, probability_real, latency_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+            self._count("written", len(batch))
+            self._count("batches")
+        except sqlite3.Error as e:
+            self._count("write_errors")
+            logger.error(f"Error writing audit batch: {str(e)}")
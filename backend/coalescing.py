@@ -0,0 +1,77 @@
+import asyncio
+
+
+class Flight:
+    """One in-flight computation shared by every request with the same key"""
+
+    def __init__(self):
+        self.waiters = 0
+        self.started = False
+        self.task = None
+
+    def abandoned(self):
+        """Whether every waiter has gone; safe to call from any thread"""
+        return self.waiters == 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests into one computation.
+
+    The first caller for a key starts work(flight) as a task; callers that
+    arrive with the same key while it runs wait on that task instead of
+    starting their own, and all of them get its result or exception. Each
+    waiter can leave on its own (deadline, disconnect) without affecting the
+    rest. When the last one leaves, work that has not set flight.started is
+    cancelled outright; work already running in a thread should check
+    flight.abandoned() and stop there.
+
+    Only requests that overlap in time are coalesced: the key is forgotten
+    as soon as its computation finishes, so nothing is cached.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._stats = {"computations": 0, "coalesced": 0, "abandoned": 0}
+
+    async def do(self, key, work):
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = Flight()
+            flight.task = asyncio.ensure_future(work(flight))
+            flight.task.add_done_callback(lambda task: self._finished(key, flight))
+            self._flights[key] = flight
+            self._stats["computations"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            # Shielded, so a waiter being cancelled only detaches it
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.abandoned() and not flight.task.done():
+                self._stats["abandoned"] += 1
+                self._forget(key, flight)
+                if not flight.started:
+                    flight.task.cancel()
+
+    def _forget(self, key, flight):
+        # Later arrivals start a fresh computation instead of joining a dying one
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _finished(self, key, flight):
+        self._forget(key, flight)
+        if not flight.task.cancelled():
+            # Mark the exception retrieved when no waiter is left to see it
+            flight.task.exception()
+
+    def stats(self):
+        requests = self._stats["computations"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "in_flight": len(self._flights),
+            "coalesced_ratio": round(self._stats["coalesced"] / requests, 4) if requests else 0.0,
+        }
@@ -0,0 +1,110 @@
+import io
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPES = ("application/vnd.apache.parquet", "application/x-parquet")
+
+ARTICLE_COLUMNS = ["title", "content"]
+
+
+class TableTooLarge(Exception):
+    """An uploaded table has more rows than the caller allows"""
+
+    def __init__(self, max_rows):
+        super().__init__(f"Table size exceeds the limit of {max_rows} articles")
+        self.max_rows = max_rows
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Columnar classification requires pyarrow to be installed")
+
+
+def read_articles(data, media_type=ARROW_STREAM_MEDIA_TYPE, max_rows=None):
+    """
+    Read an Arrow IPC stream or Parquet file into a table holding only the
+    title and content columns. With max_rows, TableTooLarge is raised
+    before decoding more rows than that: from the Parquet footer's row
+    count, or as soon as the stream's batches exceed it.
+    """
+    require_pyarrow()
+
+    if media_type in PARQUET_MEDIA_TYPES:
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        _check_columns(parquet_file.schema_arrow.names)
+        if max_rows is not None and parquet_file.metadata.num_rows > max_rows:
+            raise TableTooLarge(max_rows)
+        # Only the article columns are decoded from the file
+        return parquet_file.read(columns=ARTICLE_COLUMNS)
+
+    if media_type != ARROW_STREAM_MEDIA_TYPE:
+        raise ValueError(f"Unsupported media type: {media_type}")
+
+    reader = pa.ipc.open_stream(data)
+    _check_columns(reader.schema.names)
+    batches, rows = [], 0
+    for batch in reader:
+        rows += batch.num_rows
+        if max_rows is not None and rows > max_rows:
+            raise TableTooLarge(max_rows)
+        batches.append(batch)
+    return pa.Table.from_batches(batches, schema=reader.schema).select(ARTICLE_COLUMNS)
+
+
+def _check_columns(names):
+    missing = [column for column in ARTICLE_COLUMNS if column not in names]
+    if missing:
+        raise ValueError(f"Missing article columns: {', '.join(missing)}")
+
+
+def article_texts(table):
+    """Combined "title content" text of every row, nulls read as empty"""
+    title = pc.fill_null(pc.cast(table.column("title"), pa.string()), "")
+    content = pc.fill_null(pc.cast(table.column("content"), pa.string()), "")
+    return pc.binary_join_element_wise(title, content, " ").to_pylist()
+
+
+def classify_table(classifier, table):
+    """
+    Classify every row of an Arrow table with title/content columns.
+    Returns a record batch with prediction, confidence and probability
+    columns in row order; the model version is kept in the schema metadata.
+    """
+    require_pyarrow()
+    _check_columns(table.column_names)
+
+    labels, probabilities = classifier.predict_batch_arrays(article_texts(table))
+    return predictions_batch(labels, probabilities, classifier.model_version)
+
+
+def predictions_batch(labels, probabilities, model_version=None, preprocessing_tier=None):
+    """Record batch of predictions from predict_batch_arrays output"""
+    require_pyarrow()
+
+    metadata = {"model_version": model_version} if model_version else {}
+    if preprocessing_tier:
+        metadata["preprocessing_tier"] = preprocessing_tier
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(labels, type=pa.string()),
+            pa.array(probabilities.max(axis=1)),
+            pa.array(probabilities[:, 0]),
+            pa.array(probabilities[:, 1]),
+        ],
+        names=["prediction", "confidence", "probability_fake", "probability_real"],
+        metadata=metadata or None,
+    )
+
+
+def write_stream(batch):
+    """Serialize a record batch as an Arrow IPC stream"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
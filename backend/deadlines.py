@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from ml_pipeline import PredictionCancelled
+
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work finished"""
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client went away before its work finished"""
+
+
+class RequestDeadline:
+    """
+    Time budget of one request, plus a flag set when the client disconnects.
+
+    should_stop() is passed into the classifier, which checks it between
+    preprocessing and scoring steps in the worker thread. run() awaits the
+    request's work while watching the clock and the connection: work still
+    queued for admission is cancelled outright, work already running in the
+    thread stops at its next checkpoint, so its slot is freed promptly.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout if timeout else None
+        self.reason = None
+        self.started = False
+
+    @classmethod
+    def from_request(cls, request, default_ms=0):
+        """
+        Deadline from the X-Request-Timeout-Ms header, which may only
+        tighten the configured default (0 = no default deadline)
+        """
+        timeout_ms = default_ms or None
+        header = request.headers.get(DEADLINE_HEADER)
+        if header is not None:
+            try:
+                requested_ms = float(header)
+            except ValueError:
+                raise ValueError(f"Invalid {DEADLINE_HEADER} header: {header}")
+            if requested_ms <= 0:
+                raise ValueError(f"{DEADLINE_HEADER} must be positive")
+            timeout_ms = min(requested_ms, timeout_ms) if timeout_ms else requested_ms
+        return cls(timeout_ms / 1000 if timeout_ms else None)
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def should_stop(self):
+        """Whether the work should be abandoned; safe to call from any thread"""
+        if self.reason is None and self.expires_at is not None \
+                and time.monotonic() >= self.expires_at:
+            self.reason = "deadline"
+        return self.reason is not None
+
+    def _abandoned(self):
+        if self.reason == "disconnect":
+            return ClientDisconnected("Client disconnected before the response was ready")
+        return DeadlineExceeded(f"Request deadline of {self.timeout * 1000:.0f} ms exceeded")
+
+    async def run(self, request, work, poll_interval=0.05):
+        """
+        Await work() (a coroutine function that sets `started` once it holds
+        an inference slot), abandoning it on expiry or client disconnect
+        """
+        if self.should_stop():
+            raise self._abandoned()
+
+        task = asyncio.ensure_future(work())
+        try:
+            while True:
+                remaining = self.remaining()
+                timeout = poll_interval if remaining is None else min(poll_interval, remaining)
+                done, _ = await asyncio.wait({task}, timeout=timeout)
+                if done:
+                    break
+
+                if self.reason is None and await request.is_disconnected():
+                    self.reason = "disconnect"
+                if self.should_stop():
+                    if not self.started:
+                        # Still waiting for admission: give up the queue position now
+                        task.cancel()
+                    # Running work stops at its next checkpoint; wait for it
+                    # there instead of polling with a zero timeout
+                    break
+            return await task
+        except (asyncio.CancelledError, PredictionCancelled):
+            if self.reason is None:
+                raise
+            raise self._abandoned()
+        finally:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,80 @@
+import time
+
+from ml_pipeline import PREPROCESSING_TIERS
+
+
+class TierGovernor:
+    """
+    Picks the preprocessing tier for new requests from the current load.
+
+    Pressure is the larger of the interactive queue depth over queue_depth
+    and the smoothed interactive latency over latency_ms. A pressure of 1
+    moves serving down one tier, 2 down two (with the default tiers: full,
+    lookup, fast). A tier is only left for a more accurate one once pressure
+    drops half a step below the level that triggered it, and never within
+    hold_seconds of the last switch, so the server does not flap between
+    tiers as its own latency improves.
+    """
+
+    def __init__(self, admission, queue_depth=16, latency_ms=500.0, hold_seconds=5.0,
+                 lane="interactive", tiers=PREPROCESSING_TIERS):
+        self.admission = admission
+        self.queue_depth = queue_depth
+        self.latency_ms = latency_ms
+        self.hold_seconds = hold_seconds
+        self.lane = lane
+        self.tiers = tiers
+
+        self.level = 0
+        self._latency_ms = None  # EWMA of interactive request latency
+        self._changed_at = time.monotonic()
+        self._switches = 0
+        self._served = {tier: 0 for tier in tiers}
+
+    def observe(self, latency_ms):
+        """Record the end-to-end latency of a finished interactive request"""
+        if self._latency_ms is None:
+            self._latency_ms = latency_ms
+        else:
+            self._latency_ms = 0.9 * self._latency_ms + 0.1 * latency_ms
+
+    def pressure(self):
+        queue = self.admission.queue_depth(self.lane) / self.queue_depth if self.queue_depth else 0.0
+        latency = (self._latency_ms or 0.0) / self.latency_ms if self.latency_ms else 0.0
+        return max(queue, latency)
+
+    def current(self):
+        """Tier in force, without re-evaluating the load"""
+        return self.tiers[self.level]
+
+    def tier(self):
+        """Tier to serve the next request with"""
+        pressure = self.pressure()
+        level = min(int(pressure), len(self.tiers) - 1)
+        now = time.monotonic()
+
+        if level > self.level:
+            self._switch(level, now)
+        elif level < self.level and pressure < self.level - 0.5 \
+                and now - self._changed_at >= self.hold_seconds:
+            self._switch(max(level, self.level - 1), now)
+
+        tier = self.tiers[self.level]
+        self._served[tier] += 1
+        return tier
+
+    def _switch(self, level, now):
+        self.level = level
+        self._changed_at = now
+        self._switches += 1
+
+    def stats(self):
+        return {
+            "tier": self.tiers[self.level],
+            "pressure": round(self.pressure(), 3),
+            "latency_ewma_ms": round(self._latency_ms, 3) if self._latency_ms is not None else None,
+            "queue_threshold": self.queue_depth,
+            "latency_threshold_ms": self.latency_ms,
+            "switches": self._switches,
+            "served": dict(self._served),
+        }
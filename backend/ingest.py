@@ -0,0 +1,383 @@
+import os
+import json
+import time
+import signal
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from ml_pipeline import NewsClassifier
+
+logger = logging.getLogger(__name__)
+
+PROCESSING_DIR = "processing"
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+
+# Classifier loaded once per worker process by _init_worker
+_worker_classifier = None
+
+
+def _init_worker(model_path, precision):
+    global _worker_classifier
+    # Ctrl+C reaches the whole process group; the parent decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_classifier = NewsClassifier(precision=precision, model_path=model_path)
+    if not _worker_classifier.load_model():
+        raise RuntimeError(f"No model found at {model_path}")
+
+
+def _write_atomic(path, write):
+    """Write through a temporary file renamed into place, so readers never see partial output"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _parse_line(line):
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    title, content = record.get("title", ""), record.get("content", record.get("text", ""))
+    if not isinstance(title, str) or not isinstance(content, str):
+        raise ValueError("title and content must be strings")
+    if not title and not content:
+        raise ValueError("missing title and content")
+    return record.get("id"), f"{title} {content}"
+
+
+def classify_file(path, output_path, batch_size):
+    """
+    Worker: classify one JSONL file in batches and write one result line
+    per input line. Lines that are not valid articles get an error entry
+    instead of failing the file.
+    """
+    classifier = _worker_classifier
+    started = time.perf_counter()
+    counts = {"articles": 0, "invalid": 0}
+
+    def write(out):
+        batch = []
+
+        def flush():
+            # Invalid lines stay in the batch so results keep input order
+            texts = [text for _, _, text, _ in batch if text is not None]
+            labels, probabilities = classifier.predict_batch_arrays(texts) if texts else ([], [])
+            scored = zip(labels, probabilities)
+            for line_no, record_id, text, error in batch:
+                if text is None:
+                    out.write(json.dumps({"line": line_no, "error": error}) + "\n")
+                    continue
+                label, probs = next(scored)
+                out.write(json.dumps({
+                    "line": line_no,
+                    "id": record_id,
+                    "prediction": label,
+                    "confidence": float(max(probs)),
+                    "probability_fake": float(probs[0]),
+                    "probability_real": float(probs[1]),
+                }) + "\n")
+            counts["articles"] += len(texts)
+            batch.clear()
+
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record_id, text = _parse_line(line)
+                except ValueError as e:
+                    # json.JSONDecodeError is a ValueError too
+                    batch.append((line_no, None, None, str(e)))
+                    counts["invalid"] += 1
+                else:
+                    batch.append((line_no, record_id, text, None))
+                if len(batch) >= batch_size:
+                    flush()
+        if batch:
+            flush()
+
+    _write_atomic(output_path, write)
+    return {
+        **counts,
+        "model_version": classifier.model_version,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+class SpoolIngestor:
+    """
+    Classifies JSONL files dropped into a spool directory.
+
+    Producers should write each file under another name (a leading dot or a
+    .tmp/.part suffix) and rename it to *.jsonl when complete. A file is
+    claimed by renaming it into spool/processing/ with this process's pid
+    appended; the rename is atomic, so several ingestors can share a spool
+    without classifying a file twice. Each claimed file goes to a worker
+    process, which writes <name>.results.jsonl to the output directory. Then
+    a <name>.done marker with the file's counts is written, and the input is
+    moved to spool/done/ (spool/failed/ with an .error marker if
+    classification failed). At most max_in_flight files are claimed at once.
+    Files left in processing/ by a process that no longer runs are requeued
+    on start.
+
+    If a worker process dies (killed for memory, say), the pool is broken:
+    the files it held are requeued and a new pool is started. Which of them
+    killed it is unknown, so each is then retried with no other file in
+    flight. A file whose worker dies max_attempts times while it ran alone
+    is moved to failed/, so a file that always kills its worker cannot stall
+    the spool.
+    """
+
+    def __init__(self, spool_dir, output_dir, model_path, precision="float64", workers=2,
+                 max_in_flight=None, batch_size=256, poll_interval=1.0, settle_seconds=1.0,
+                 max_attempts=3):
+        self.spool_dir = os.path.abspath(spool_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.model_path = os.path.abspath(model_path)
+        self.precision = precision
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.max_attempts = max_attempts
+
+        self.stats = {"files": 0, "failed_files": 0, "requeued_files": 0, "pool_restarts": 0,
+                      "articles": 0, "invalid": 0}
+        self.started = None
+        self._stopping = False
+        self._attempts = {}  # Worker deaths per file name, counted when it ran alone
+        self._suspects = set()  # Files in flight when a worker died, retried alone
+
+        for directory in (PROCESSING_DIR, DONE_DIR, FAILED_DIR):
+            os.makedirs(os.path.join(self.spool_dir, directory), exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def stop(self):
+        """Stop claiming new files; in-flight files are finished first"""
+        self._stopping = True
+
+    def recover(self):
+        """
+        Requeue files claimed by ingestors that are no longer running. Run
+        before this process claims anything: a claim tagged with its own pid
+        is left from an earlier run (containers restart with the same pid).
+        """
+        processing = os.path.join(self.spool_dir, PROCESSING_DIR)
+        for claimed in os.listdir(processing):
+            name, _, pid = claimed.rpartition(".")
+            if not pid.isdigit() or (int(pid) != os.getpid() and _process_alive(int(pid))):
+                continue
+            try:
+                os.rename(os.path.join(processing, claimed), os.path.join(self.spool_dir, name))
+                logger.info(f"Requeued {name} from stopped ingestor {pid}")
+            except FileNotFoundError:
+                pass
+
+    def pending_files(self):
+        """Complete *.jsonl files waiting in the spool, oldest first"""
+        now = time.time()
+        candidates = []
+        for entry in os.scandir(self.spool_dir):
+            if not entry.is_file() or entry.name.startswith(".") \
+                    or not entry.name.endswith(".jsonl"):
+                continue
+            try:
+                modified = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            # Skip files that may still be being written in place
+            if now - modified >= self.settle_seconds:
+                candidates.append((modified, entry.name))
+        return [name for _, name in sorted(candidates)]
+
+    def claim(self, name):
+        """Atomically take a spool file; None if another ingestor got it first"""
+        claimed = os.path.join(self.spool_dir, PROCESSING_DIR, f"{name}.{os.getpid()}")
+        try:
+            os.rename(os.path.join(self.spool_dir, name), claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def run(self, once=False, report_interval=30.0):
+        """
+        Process the spool until stop() is called, or until it is empty
+        with once=True. Returns the final throughput report.
+        """
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"No model found at {self.model_path}")
+
+        self.recover()
+        self.started = time.perf_counter()
+        last_report = self.started
+        in_flight = {}
+
+        executor = self._create_executor()
+        try:
+            while True:
+                broken = False
+                if not self._stopping:
+                    for name in self.pending_files():
+                        if len(in_flight) >= self.max_in_flight:
+                            break
+                        if name in self._suspects and in_flight:
+                            # Let the pool drain so it runs alone
+                            break
+                        claimed = self.claim(name)
+                        if claimed is None:
+                            continue
+                        output_path = os.path.join(self.output_dir, _results_name(name))
+                        try:
+                            future = executor.submit(classify_file, claimed, output_path,
+                                                     self.batch_size)
+                        except BrokenProcessPool:
+                            # Not this file's fault; put it back without counting it
+                            os.rename(claimed, os.path.join(self.spool_dir, name))
+                            broken = True
+                            break
+                        in_flight[future] = (name, claimed)
+                        if name in self._suspects:
+                            break
+
+                if not in_flight and not broken:
+                    if self._stopping or (once and not self.pending_files()):
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=self.poll_interval,
+                               return_when=FIRST_COMPLETED)
+                alone = len(in_flight) == 1
+                for future in done:
+                    broken |= self._finish(*in_flight.pop(future), future, alone)
+
+                if broken:
+                    # Every file still on the dead pool fails the same way
+                    for future in wait(in_flight).done:
+                        self._finish(*in_flight.pop(future), future, alone)
+                    executor.shutdown(wait=True)
+                    self.stats["pool_restarts"] += 1
+                    logger.warning("A worker process died; restarting the pool")
+                    executor = self._create_executor()
+
+                if report_interval and time.perf_counter() - last_report >= report_interval:
+                    logger.info(self._format(self.report(in_flight=len(in_flight))))
+                    last_report = time.perf_counter()
+        finally:
+            executor.shutdown(wait=True)
+
+        report = self.report()
+        logger.info(self._format(report))
+        return report
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.model_path, self.precision))
+
+    def _finish(self, name, claimed, future, alone=False):
+        """Record a finished file; True if its worker pool broke"""
+        stem = name[:-len(".jsonl")]
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            self._suspects.add(name)
+            if alone:
+                self._attempts[name] = self._attempts.get(name, 0) + 1
+            if self._attempts.get(name, 0) >= self.max_attempts:
+                self._forget(name)
+                self._fail(name, claimed, e)
+            else:
+                os.rename(claimed, os.path.join(self.spool_dir, name))
+                self.stats["requeued_files"] += 1
+                logger.warning(f"Requeued {name} after a worker died "
+                               f"({self._attempts.get(name, 0)} of {self.max_attempts} "
+                               f"failed attempts on its own)")
+            return True
+        except Exception as e:
+            self._forget(name)
+            self._fail(name, claimed, e)
+            return False
+
+        self._forget(name)
+        self.stats["files"] += 1
+        self.stats["articles"] += result["articles"]
+        self.stats["invalid"] += result["invalid"]
+        _write_atomic(os.path.join(self.output_dir, f"{stem}.done"),
+                      lambda f: json.dump({"file": name, **result}, f))
+        os.replace(claimed, os.path.join(self.spool_dir, DONE_DIR, name))
+        return False
+
+    def _forget(self, name):
+        self._attempts.pop(name, None)
+        self._suspects.discard(name)
+
+    def _fail(self, name, claimed, error):
+        logger.error(f"Failed to classify {name}: {str(error)}")
+        self.stats["failed_files"] += 1
+        _write_atomic(os.path.join(self.spool_dir, FAILED_DIR, f"{name[:-len('.jsonl')]}.error"),
+                      lambda f: f.write(f"{type(error).__name__}: {error}\n"))
+        os.replace(claimed, os.path.join(self.spool_dir, FAILED_DIR, name))
+
+    def report(self, in_flight=0):
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            **self.stats,
+            "in_flight": in_flight,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.stats["files"] / elapsed, 3) if elapsed else 0.0,
+            "articles_per_second": round(self.stats["articles"] / elapsed, 1) if elapsed else 0.0,
+        }
+
+    @staticmethod
+    def _format(report):
+        return (f"Ingested {report['files']} files ({report['failed_files']} failed), "
+                f"{report['articles']} articles ({report['invalid']} invalid lines) in "
+                f"{report['elapsed_seconds']:.1f}s: {report['articles_per_second']} articles/s, "
+                f"{report['in_flight']} files in flight")
+
+
+def _results_name(name):
+    return f"{name[:-len('.jsonl')]}.results.jsonl"
+
+
+def _process_alive(pid):
+    if os.name == "nt":
+        return _windows_process_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _windows_process_alive(pid):
+    # os.kill(pid, 0) sends CTRL_C_EVENT on Windows, so ask the kernel instead
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # A process we may not query still exists
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
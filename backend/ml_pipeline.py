@@ -4,7 +4,14 @@ import re
 import string
 import joblib
 import os
+import copy
+import time
+import sys
+import hashlib
+import sqlite3
+import threading
 from datetime import datetime
+from collections import Counter
 import logging
 
 # NLP libraries
@@ -16,12 +23,23 @@ from nltk.corpus import wordnet
 
 # ML libraries
 from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import (
+    TfidfVectorizer, HashingVectorizer, TfidfTransformer, ENGLISH_STOP_WORDS
+)
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_selection import chi2
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
+from sklearn.utils import murmurhash3_32
+
+from profiling import StageProfiler
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
 
 # Download required NLTK data
 try:
@@ -49,13 +67,61 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def preprocess_text(text):
+# NLTK corpora are loaded lazily and the loaders are not thread-safe, so the
+# stopword set and lemmatizer are built once under a lock and shared
+_stop_words = None
+_lemmatizer = None
+_nlp_resources_lock = threading.Lock()
+
+# Preprocessing tiers, most accurate first. The cheaper tiers split the
+# cleaned text on whitespace instead of running NLTK's word_tokenize, which
+# only differs on a few contractions such as "cannot". "lookup" then takes
+# lemmas from the model's lemma table, built from its training corpus by
+# build_lemma_table (unknown words are kept as they are); "fast" skips
+# lemmatization.
+PREPROCESSING_TIERS = ("full", "lookup", "fast")
+LEMMA_TABLE_SIZE = 200000
+
+
+def get_nlp_resources():
     """
-    Comprehensive text preprocessing function
+    Return the shared (stop_words, lemmatizer) pair, loading the NLTK
+    corpora on first use
     """
-    if not isinstance(text, str):
-        return ""
+    global _stop_words, _lemmatizer
+
+    if _stop_words is None:
+        with _nlp_resources_lock:
+            if _stop_words is None:
+                lemmatizer = WordNetLemmatizer()
+                # Force the lazy WordNet corpus to load now
+                lemmatizer.lemmatize("articles")
+                _lemmatizer = lemmatizer
+                _stop_words = set(stopwords.words('english'))
+
+    return _stop_words, _lemmatizer
 
+
+def split_tokens(text, tier="full"):
+    """Tokenize cleaned text in the given preprocessing tier"""
+    return word_tokenize(text) if tier == "full" else text.split()
+
+
+def lemmatize_token(token, lemmatizer, tier="full", lemma_table=None):
+    """Lemma of one token in the given preprocessing tier"""
+    if tier == "full":
+        return lemmatizer.lemmatize(token)
+    if tier == "lookup":
+        return lemma_table.get(token, token) if lemma_table else token
+    if tier == "fast":
+        return token
+    raise ValueError(f"Unsupported preprocessing tier: {tier}")
+
+
+def clean_text(text):
+    """
+    Lowercase and strip URLs, emails, HTML, digits and punctuation
+    """
     # Convert to lowercase
     text = text.lower()
 
@@ -72,18 +138,50 @@ def preprocess_text(text):
     text = re.sub(r'[^a-zA-Z\s]', '', text)
 
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def build_lemma_table(word_counts, is_feature=None, max_size=LEMMA_TABLE_SIZE):
+    """
+    Lemma table for the "lookup" tier from the word counts of a training
+    corpus: the WordNet lemma of each word it changes, most frequent words
+    first. With is_feature, only words whose lemma passes it (a model
+    feature seen in training) are kept, since the others cannot affect a
+    prediction.
+    """
+    stop_words, lemmatizer = get_nlp_resources()
+
+    table = {}
+    for word, _ in word_counts.most_common():
+        if len(table) >= max_size:
+            break
+        if word in stop_words:
+            continue
+        lemma = lemmatizer.lemmatize(word)
+        if lemma != word and (is_feature is None or is_feature(lemma)):
+            table[word] = lemma
+    return table
+
+
+def preprocess_text(text, tier="full", lemma_table=None):
+    """
+    Comprehensive text preprocessing function
+    """
+    if not isinstance(text, str):
+        return ""
+
+    text = clean_text(text)
 
     # Tokenization
-    tokens = word_tokenize(text)
+    tokens = split_tokens(text, tier)
+
+    stop_words, lemmatizer = get_nlp_resources()
 
     # Remove stopwords
-    stop_words = set(stopwords.words('english'))
     tokens = [token for token in tokens if token not in stop_words]
 
     # Lemmatization
-    lemmatizer = WordNetLemmatizer()
-    tokens = [lemmatizer.lemmatize(token) for token in tokens]
+    tokens = [lemmatize_token(token, lemmatizer, tier, lemma_table) for token in tokens]
 
     # Remove short words (less than 3 characters)
     tokens = [token for token in tokens if len(token) >= 3]
@@ -91,6 +189,79 @@ def preprocess_text(text):
     return ' '.join(tokens)
 
 
+def tokenize_text(text, tier="full", lemma_table=None, word_counts=None):
+    """
+    Single-pass preprocessing to the final tokens the model sees.
+
+    Applies the same steps as preprocess_text plus the English stop-word
+    filter TfidfVectorizer(stop_words='english') used to apply afterwards,
+    in one loop over the tokens and without joining them into a string.
+    tier selects how tokens are lemmatized (see PREPROCESSING_TIERS);
+    lemma_table is the table the "lookup" tier reads. word_counts, a
+    Counter, is updated with the words seen before lemmatization.
+    """
+    if not isinstance(text, str):
+        return []
+
+    stop_words, lemmatizer = get_nlp_resources()
+
+    tokens = []
+    for token in split_tokens(clean_text(text), tier):
+        # NLTK stopwords are removed before lemmatization
+        if token in stop_words:
+            continue
+        if word_counts is not None:
+            word_counts[token] += 1
+        lemma = lemmatize_token(token, lemmatizer, tier, lemma_table)
+        # Short words and vectorizer stop words are removed after it
+        if len(lemma) >= 3 and lemma not in ENGLISH_STOP_WORDS:
+            # Interned so a training corpus holds one copy of each term
+            tokens.append(sys.intern(lemma))
+
+    return tokens
+
+
+class TextAnalyzer:
+    """
+    Vectorizer analyzer that tokenizes, filters and builds n-grams for each
+    article exactly once. Accepts raw text, or a token list that was
+    already produced by tokenize_text.
+    """
+
+    def __init__(self, ngram_range=(1, 2)):
+        self.ngram_range = ngram_range
+
+    def __call__(self, doc):
+        tokens = doc if isinstance(doc, list) else tokenize_text(doc)
+
+        min_n, max_n = self.ngram_range
+        features = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            features.extend(
+                ' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return features
+
+
+def uses_fused_analyzer(vectorizer):
+    """
+    Whether a fitted vectorizer analyzes raw text with TextAnalyzer, rather
+    than re-tokenizing preprocess_text output (models trained before the
+    fused analyzer)
+    """
+    if isinstance(vectorizer, Pipeline):
+        vectorizer = vectorizer.named_steps['hashing']
+    return isinstance(vectorizer.analyzer, TextAnalyzer)
+
+
+# Representative inputs used to exercise the full predict path during warm-up
+WARMUP_ARTICLES = [
+    "Federal Reserve announces interest rate decision after monthly meeting",
+    "Scientists discover that drinking water causes cancer in 99% of cases",
+    "<p>City council approves budget</p> for infrastructure, see https://example.org "
+    "or email press@example.org for the full report on 2024 spending",
+]
+
+
 def create_sample_dataset():
     """
     Create a sample dataset for training if no external dataset is available
@@ -156,125 +327,458 @@ def create_sample_dataset():
     return df
 
 
+TRAINING_COLUMNS = ['title', 'text', 'label']
+
+
+class PredictionCancelled(Exception):
+    """Raised when a caller's should_stop check asks to abandon a prediction"""
+
+
+def _check_cancelled(should_stop):
+    if should_stop is not None and should_stop():
+        raise PredictionCancelled()
+
+TEXT_DTYPE = "string[pyarrow]" if pyarrow is not None else "string"
+# Readers build Arrow-backed columns directly instead of object arrays
+DTYPE_BACKEND = "pyarrow" if pyarrow is not None else "numpy_nullable"
+
+
+def compact_training_frame(df):
+    """
+    Project a training DataFrame to title/text/label, store the text columns
+    as (Arrow-backed when available) strings and the label as int8
+    """
+    missing = [column for column in TRAINING_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Training data is missing columns: {', '.join(missing)}")
+
+    labels = pd.to_numeric(df['label'], downcast='integer')
+    if not labels.isin([0, 1]).all():
+        raise ValueError("Training labels must be 0 (fake) or 1 (real)")
+
+    return pd.DataFrame({
+        'title': df['title'].astype(TEXT_DTYPE),
+        'text': df['text'].astype(TEXT_DTYPE),
+        'label': labels.astype(np.int8),
+    })
+
+
+def read_training_data(source, table="articles"):
+    """
+    Read title/text/label training data from a Parquet file, an SQLite
+    database table or a CSV file, loading only those three columns
+    """
+    extension = os.path.splitext(source)[1].lower()
+
+    if extension in (".parquet", ".pq"):
+        df = pd.read_parquet(source, columns=TRAINING_COLUMNS,
+                             dtype_backend=DTYPE_BACKEND)
+    elif extension in (".db", ".sqlite", ".sqlite3"):
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid table name: {table}")
+        with sqlite3.connect(source) as conn:
+            df = pd.read_sql_query(f"SELECT title, text, label FROM {table}", conn,
+                                   dtype_backend=DTYPE_BACKEND)
+    elif extension == ".csv":
+        df = pd.read_csv(source, usecols=TRAINING_COLUMNS, dtype_backend=DTYPE_BACKEND)
+    else:
+        raise ValueError(f"Unsupported training data format: {source}")
+
+    return compact_training_frame(df)
+
+
+def create_synthetic_dataset(n_articles, seed=42, vocabulary_size=50000, label_noise=0.05):
+    """
+    Generate a labeled synthetic corpus for benchmarking at scale.
+    Articles mix Zipf-distributed filler words from a generated lexicon with
+    class-leaning words taken from the sample dataset.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Class-leaning words from the sample articles
+    sample = create_sample_dataset()
+    class_words = {}
+    for label in (0, 1):
+        words = ' '.join(sample.loc[sample['label'] == label, 'text']).lower().split()
+        class_words[label] = np.array(sorted(
+            {word for word in words if word.isalpha() and len(word) >= 4}))
+
+    # Pronounceable pseudo-words give a long-tailed vocabulary that grows
+    # with the corpus like real news text does
+    syllables = np.array([c + v for c in "bcdfghklmnprstvz" for v in "aeiou"])
+    lengths = rng.integers(2, 5, size=vocabulary_size * 2)
+    pieces = rng.choice(syllables, size=(vocabulary_size * 2, 4))
+    lexicon = np.array(sorted({''.join(row[:n]) for row, n in zip(pieces, lengths)}))
+    lexicon = rng.permutation(lexicon)[:vocabulary_size]
+    weights = 1.0 / np.arange(1, len(lexicon) + 1) ** 1.1
+    weights /= weights.sum()
+
+    labels = rng.integers(0, 2, size=n_articles)
+    # A share of articles carry the other class's vocabulary so the task isn't trivial
+    signal_labels = np.where(rng.random(n_articles) < label_noise, 1 - labels, labels)
+
+    filler_lengths = rng.integers(20, 120, size=n_articles)
+    filler = lexicon[rng.choice(len(lexicon), size=filler_lengths.sum(), p=weights)]
+    offsets = np.concatenate([[0], np.cumsum(filler_lengths)])
+
+    titles = []
+    texts = []
+    for i in range(n_articles):
+        words = class_words[signal_labels[i]]
+        signal = words[rng.integers(0, len(words), size=max(2, filler_lengths[i] // 8))]
+        tokens = np.concatenate([filler[offsets[i]:offsets[i + 1]], signal])
+        rng.shuffle(tokens)
+        titles.append(' '.join(tokens[:8]))
+        texts.append(' '.join(tokens))
+
+    return pd.DataFrame({'title': titles, 'text': texts, 'label': labels})
+
+
+def build_tfidf_vectorizer(vocabulary=None):
+    """
+    Vocabulary-based TF-IDF vectorizer over the fused analyzer. A fixed
+    vocabulary (used after pruning) replaces the frequency-based selection.
+    """
+    return TfidfVectorizer(
+        analyzer=TextAnalyzer(ngram_range=(1, 2)),
+        vocabulary=vocabulary,
+        max_features=5000,
+        min_df=2,
+        max_df=0.95
+    )
+
+
+def select_features(model, features, labels, n_keep, method="coef"):
+    """
+    Indices of the n_keep most useful features of a fitted model, in
+    ascending order. "coef" ranks by absolute coefficient, "chi2" by the
+    chi-squared statistic of each feature against the labels.
+    """
+    if method == "coef":
+        scores = np.abs(model.coef_).max(axis=0)
+    elif method == "chi2":
+        scores, _ = chi2(features, labels)
+        scores = np.nan_to_num(scores)
+    else:
+        raise ValueError(f"Unsupported pruning method: {method}")
+
+    n_keep = min(n_keep, len(scores))
+    return np.sort(np.argsort(scores)[::-1][:n_keep])
+
+
+def build_hashing_vectorizer(n_features=2 ** 18):
+    """
+    Stateless alternative to the fitted TfidfVectorizer: feature hashing
+    followed by a stored idf vector, so no vocabulary dict is kept
+    """
+    return Pipeline([
+        ('hashing', HashingVectorizer(
+            analyzer=TextAnalyzer(ngram_range=(1, 2)),
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None
+        )),
+        ('idf', TfidfTransformer())
+    ])
+
+
+def get_idf_step(vectorizer):
+    """
+    Return the component holding the idf weights for either vectorizer type
+    """
+    if isinstance(vectorizer, Pipeline):
+        return vectorizer.named_steps['idf']
+    return vectorizer
+
+
+def to_compact_precision(pipeline):
+    """
+    Return a copy of a fitted pipeline that stores idf weights and
+    classifier coefficients as float32 and produces float32 sparse matrices
+    """
+    compact = copy.deepcopy(pipeline)
+
+    vectorizer = compact.named_steps['tfidf']
+    if isinstance(vectorizer, Pipeline):
+        vectorizer.named_steps['hashing'].dtype = np.float32
+    else:
+        vectorizer.dtype = np.float32
+
+    idf_step = get_idf_step(vectorizer)
+    idf_step.idf_ = idf_step.idf_.astype(np.float32)
+
+    model = compact.named_steps['classifier']
+    model.coef_ = model.coef_.astype(np.float32)
+    model.intercept_ = model.intercept_.astype(np.float32)
+
+    return compact
+
+
+def _object_bytes(value, seen):
+    """Approximate memory held by one fitted attribute value"""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        size = value.nbytes
+        if value.dtype == object:
+            size += sum(sys.getsizeof(item) for item in value.ravel())
+        return size
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _object_bytes(key, seen) + _object_bytes(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_object_bytes(item, seen) for item in value)
+    if hasattr(value, "get_params"):
+        return sum(_object_bytes(item, seen) for item in vars(value).values())
+    return sys.getsizeof(value)
+
+
+def estimate_model_bytes(classifier):
+    """
+    Approximate in-memory size of a loaded classifier: its arrays,
+    vocabulary dict, cached feature names and lemma table
+    """
+    seen = set()
+    return (_object_bytes(classifier.pipeline, seen)
+            + _object_bytes(classifier.feature_names, seen)
+            + _object_bytes(classifier.lemma_table, seen))
+
+
 class NewsClassifier:
-    def __init__(self):
+    def __init__(self, precision="float64", model_path="models/news_classifier.joblib",
+                 data_source=None, data_table="articles"):
+        if precision not in ("float64", "float32"):
+            raise ValueError(f"Unsupported precision: {precision}")
+
         self.model = None
         self.vectorizer = None
         self.pipeline = None
         self.model_info = {}
+        self.lemma_table = {}
+        self.training_profile = None
+        self.feature_names = None
+        self.fused = False
+        self.model_version = None
+        self.monitor = None
+        self.precision = precision
+        self.model_path = model_path
+        self.data_source = data_source
+        self.data_table = data_table
 
         # Ensure models directory exists
-        os.makedirs("models", exist_ok=True)
+        os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
 
     def load_data(self):
         """
-        Load training data. In a real scenario, this would load from a large dataset.
-        For this demo, we'll use a sample dataset.
+        Load training data from self.data_source (Parquet, SQLite or CSV),
+        or the sample dataset when no source is configured
         """
         logger.info("Loading training data...")
 
-        # Try to load external dataset first, fallback to sample data
-        try:
-            # You can replace this with actual dataset loading
-            # df = pd.read_csv('path_to_your_dataset.csv')
-            df = create_sample_dataset()
-            logger.info(f"Loaded {len(df)} articles for training")
-            return df
-        except Exception as e:
-            logger.warning(f"Could not load external dataset: {e}")
-            logger.info("Using sample dataset for demonstration")
-            return create_sample_dataset()
+        # A configured source that fails to load is an error; falling back
+        # to the sample would overwrite the artifact with a toy model
+        if self.data_source:
+            try:
+                df = read_training_data(self.data_source, table=self.data_table)
+            except Exception as e:
+                logger.error(f"Could not load training data from {self.data_source}: {e}")
+                raise
+        else:
+            logger.info("No training data configured, using sample dataset for demonstration")
+            df = compact_training_frame(create_sample_dataset())
+
+        logger.info(f"Loaded {len(df)} articles for training")
+        return df
 
-    def prepare_features(self, df):
+    def prepare_features(self, df, executor=None, n_workers=1, word_counts=None):
         """
-        Prepare features for training
+        Prepare features for training. With an executor the preprocessing
+        is sharded across its worker processes. word_counts, a Counter, is
+        updated with the surface words of the corpus.
         """
         logger.info("Preparing features...")
 
-        # Combine title and text
-        df['combined_text'] = df['title'].fillna(
-            '') + ' ' + df['text'].fillna('')
+        # Combine title and text one article at a time rather than as a
+        # full extra column
+        combined = (f"{title} {text}" for title, text in
+                    zip(df['title'].fillna(''), df['text'].fillna('')))
 
-        # Preprocess text
-        df['processed_text'] = df['combined_text'].apply(preprocess_text)
+        # Tokenize once; the vectorizer's analyzer builds n-grams from the tokens
+        if executor is not None:
+            from parallel_training import parallel_preprocess
+            tokens = parallel_preprocess(combined, executor, n_workers, word_counts)
+        else:
+            tokens = [tokenize_text(text, word_counts=word_counts) for text in combined]
 
-        # Remove empty texts
-        df = df[df['processed_text'].str.len() > 0]
+        # Keep only what training needs, without the raw text columns
+        features = pd.DataFrame({'tokens': tokens, 'label': df['label'].to_numpy()},
+                                index=df.index)
 
-        return df
+        # Remove empty texts
+        return features[features['tokens'].str.len() > 0]
 
-    def train_model(self, retrain=False):
+    def train_model(self, retrain=False, vectorizer_type="tfidf", hash_features=2 ** 18,
+                    data=None, n_workers=1, prune_features=None, prune_method="coef",
+                    profile_memory=False):
         """
-        Train the news classification model
+        Train the news classification model.
+
+        vectorizer_type "tfidf" fits a vocabulary-based TfidfVectorizer;
+        "hashing" uses feature hashing plus a stored idf vector so the served
+        model holds only numeric arrays. `data` overrides load_data().
+        n_workers > 1 shards preprocessing and fitting across a process pool
+        and averages the per-shard coefficients (hashing vectorizer only).
+        prune_features keeps only that many features, chosen by prune_method
+        ("coef" or "chi2"), and refits a smaller vectorizer and classifier on
+        them (tfidf vectorizer only). Wall time and RSS of every stage are
+        recorded in model_info['training_profile'] (up to saving) and
+        self.training_profile (including it); profile_memory adds
+        tracemalloc peaks, at the cost of slowing allocation-heavy stages.
         """
+        if vectorizer_type not in ("tfidf", "hashing"):
+            raise ValueError(f"Unsupported vectorizer type: {vectorizer_type}")
+        if n_workers > 1 and vectorizer_type != "hashing":
+            raise ValueError("Parallel training requires vectorizer_type='hashing'")
+        if prune_features is not None:
+            if vectorizer_type != "tfidf":
+                raise ValueError("Feature pruning requires vectorizer_type='tfidf'")
+            if prune_method not in ("coef", "chi2"):
+                raise ValueError(f"Unsupported pruning method: {prune_method}")
+
+        executor = None
+        profiler = StageProfiler(trace_memory=profile_memory)
         try:
             logger.info("Starting model training...")
 
-            # Load and prepare data
-            df = self.load_data()
-            df = self.prepare_features(df)
-
-            # Split features and target
-            X = df['processed_text']
-            y = df['label']
-
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-
-            # Create TF-IDF vectorizer
-            self.vectorizer = TfidfVectorizer(
-                max_features=5000,
-                ngram_range=(1, 2),
-                min_df=2,
-                max_df=0.95,
-                stop_words='english'
-            )
-
-            # Create and train model pipeline
-            self.model = LogisticRegression(
-                random_state=42,
-                max_iter=1000,
-                C=1.0
-            )
-
-            # Create pipeline
-            self.pipeline = Pipeline([
-                ('tfidf', self.vectorizer),
-                ('classifier', self.model)
-            ])
-
-            # Train the model
-            logger.info("Training the model...")
-            self.pipeline.fit(X_train, y_train)
-
-            # Evaluate model
-            train_score = self.pipeline.score(X_train, y_train)
-            test_score = self.pipeline.score(X_test, y_test)
-
-            # Make predictions for detailed metrics
-            y_pred = self.pipeline.predict(X_test)
-
-            # Calculate metrics
-            metrics = {
-                'train_accuracy': float(train_score),
-                'test_accuracy': float(test_score),
-                'classification_report': classification_report(y_test, y_pred, output_dict=True),
-                'training_samples': len(X_train),
-                'test_samples': len(X_test),
-                'features_count': len(self.vectorizer.get_feature_names_out()) if hasattr(self.vectorizer, 'get_feature_names_out') else 'N/A'
-            }
-
-            # Store model info
-            self.model_info = {
-                'trained_at': datetime.now().isoformat(),
-                'model_type': 'Logistic Regression with TF-IDF',
-                'metrics': metrics
-            }
-
-            # Save model
-            self.save_model()
+            if n_workers > 1:
+                from parallel_training import create_executor, fit_parallel
+                executor = create_executor(n_workers)
+
+            with profiler:
+                # Load and prepare data
+                with profiler.stage("load"):
+                    df = self.load_data() if data is None else compact_training_frame(data)
+                with profiler.stage("preprocess"):
+                    # Surface words are counted for the lookup tier's lemma table
+                    word_counts = Counter()
+                    df = self.prepare_features(df, executor=executor, n_workers=n_workers,
+                                               word_counts=word_counts)
+
+                # Split features and target
+                X = df['tokens']
+                y = df['label']
+
+                # Split data
+                with profiler.stage("split"):
+                    X_train, X_test, y_train, y_test = train_test_split(
+                        X, y, test_size=0.2, random_state=42, stratify=y
+                    )
+                    del df, X, y
+
+                if vectorizer_type == "hashing":
+                    # Create hashed TF-IDF vectorizer
+                    self.vectorizer = build_hashing_vectorizer(n_features=hash_features)
+                else:
+                    # Create TF-IDF vectorizer
+                    self.vectorizer = build_tfidf_vectorizer()
+
+                # Create and train model pipeline
+                classifier_params = {'random_state': 42, 'max_iter': 1000, 'C': 1.0}
+                self.model = LogisticRegression(**classifier_params)
+
+                # Train the model
+                logger.info("Training the model...")
+                train_features = None
+                if executor is None:
+                    with profiler.stage("vectorize"):
+                        train_features = self.vectorizer.fit_transform(X_train)
+
+                pruning = None
+                with profiler.stage("fit"):
+                    if executor is not None:
+                        # Workers vectorize and fit their shards, so this
+                        # stage covers both; their memory is not traced here
+                        self.vectorizer, self.model, _ = fit_parallel(
+                            X_train, y_train, executor, n_workers, classifier_params,
+                            n_features=hash_features)
+                    else:
+                        self.model.fit(train_features, y_train)
+
+                    # Create pipeline from the fitted steps
+                    self.pipeline = Pipeline([
+                        ('tfidf', self.vectorizer),
+                        ('classifier', self.model)
+                    ])
+
+                    if prune_features is not None:
+                        pruning = self._prune(X_train, y_train, train_features, prune_features,
+                                              prune_method, classifier_params)
+                        train_features = None
+
+                with profiler.stage("lemmas"):
+                    # Only words whose lemma is a feature of the fitted model
+                    if vectorizer_type == "hashing":
+                        # Buckets no training document hit carry the maximum idf
+                        idf = get_idf_step(self.vectorizer).idf_
+                        seen_buckets = idf < idf.max()
+
+                        def is_feature(lemma):
+                            bucket = abs(murmurhash3_32(lemma, seed=0)) % len(seen_buckets)
+                            return seen_buckets[bucket]
+                    else:
+                        is_feature = self.vectorizer.vocabulary_.__contains__
+                    self.lemma_table = build_lemma_table(word_counts, is_feature)
+                    del word_counts
+
+                # Evaluate model
+                with profiler.stage("evaluate"):
+                    if train_features is None:
+                        train_features = self.vectorizer.transform(X_train)
+                    test_features = self.vectorizer.transform(X_test)
+                    train_score = self.model.score(train_features, y_train)
+
+                    # Make predictions for detailed metrics
+                    y_pred = self.model.predict(test_features)
+                    test_score = accuracy_score(y_test, y_pred)
+                    del train_features, test_features
+
+                # Calculate metrics
+                metrics = {
+                    'train_accuracy': float(train_score),
+                    'test_accuracy': float(test_score),
+                    'classification_report': classification_report(y_test, y_pred, output_dict=True),
+                    'training_samples': len(X_train),
+                    'test_samples': len(X_test),
+                    'features_count': (hash_features if vectorizer_type == "hashing"
+                                       else len(self.vectorizer.vocabulary_)),
+                    'lemma_table_size': len(self.lemma_table),
+                    'training_workers': n_workers,
+                    'preprocess_seconds': profiler.seconds("preprocess"),
+                    'fit_seconds': round(profiler.seconds("vectorize") + profiler.seconds("fit"), 3),
+                    'pruning': pruning
+                }
+
+                # Store model info
+                self.model_info = {
+                    'trained_at': datetime.now().isoformat(),
+                    'model_type': ('Logistic Regression with hashed TF-IDF'
+                                   if vectorizer_type == "hashing"
+                                   else 'Logistic Regression with TF-IDF'),
+                    'vectorizer_type': vectorizer_type,
+                    'metrics': metrics,
+                    'training_profile': profiler.report()
+                }
+
+                # Save model. model_info stays as saved, since it is served
+                # under the artifact's version; training_profile adds this stage
+                with profiler.stage("save"):
+                    self.save_model()
+            self.training_profile = profiler.report()
+
+            # Serve from the configured precision; the saved artifact keeps float64
+            self._use_pipeline(self.pipeline)
 
             logger.info(
                 f"Model training completed! Test accuracy: {test_score:.4f}")
@@ -283,6 +787,33 @@ class NewsClassifier:
         except Exception as e:
             logger.error(f"Error during model training: {str(e)}")
             raise
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _prune(self, X_train, y_train, train_features, n_keep, method, classifier_params):
+        """
+        Replace the fitted TF-IDF pipeline with one restricted to the
+        n_keep selected features, refitted on the training split
+        """
+        features_before = len(self.vectorizer.vocabulary_)
+        kept = select_features(self.model, train_features, y_train, n_keep, method=method)
+        terms = self.vectorizer.get_feature_names_out()[kept]
+        logger.info(f"Pruning vocabulary from {features_before} to {len(terms)} features")
+
+        self.vectorizer = build_tfidf_vectorizer(vocabulary=list(terms))
+        self.model = LogisticRegression(**classifier_params)
+        self.pipeline = Pipeline([
+            ('tfidf', self.vectorizer),
+            ('classifier', self.model)
+        ])
+        self.pipeline.fit(X_train, y_train)
+
+        return {
+            'method': method,
+            'features_before': features_before,
+            'features_after': len(terms),
+        }
 
     def save_model(self):
         """
@@ -291,9 +822,10 @@ class NewsClassifier:
         try:
             model_data = {
                 'pipeline': self.pipeline,
+                'lemma_table': self.lemma_table,
                 'model_info': self.model_info
             }
-            joblib.dump(model_data, 'models/news_classifier.joblib')
+            joblib.dump(model_data, self.model_path)
             logger.info("Model saved successfully")
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
@@ -304,14 +836,13 @@ class NewsClassifier:
         Load a pre-trained model
         """
         try:
-            if os.path.exists('models/news_classifier.joblib'):
-                model_data = joblib.load('models/news_classifier.joblib')
-                self.pipeline = model_data['pipeline']
+            if os.path.exists(self.model_path):
+                model_data = joblib.load(self.model_path)
                 self.model_info = model_data.get('model_info', {})
-
-                # Extract components for compatibility
-                self.model = self.pipeline.named_steps['classifier']
-                self.vectorizer = self.pipeline.named_steps['tfidf']
+                # Artifacts from before the lookup tier have no table; it
+                # then keeps words as they are, like the fast tier
+                self.lemma_table = model_data.get('lemma_table', {})
+                self._use_pipeline(model_data['pipeline'])
 
                 logger.info("Model loaded successfully")
                 return True
@@ -322,35 +853,320 @@ class NewsClassifier:
             logger.error(f"Error loading model: {str(e)}")
             raise
 
+    def _use_pipeline(self, pipeline):
+        """
+        Install a fitted pipeline for serving in the configured precision
+        """
+        if self.precision == "float32":
+            pipeline = to_compact_precision(pipeline)
+
+        self.pipeline = pipeline
+        self.model_version = self._compute_model_version()
+
+        # Extract components for compatibility
+        self.model = self.pipeline.named_steps['classifier']
+        self.vectorizer = self.pipeline.named_steps['tfidf']
+        self.fused = uses_fused_analyzer(self.vectorizer)
+        self._term_weights = None
+
+        # Cache the feature names so explanations don't rebuild the array
+        # from the vocabulary dict on every request. Hashed features have
+        # no names; explanations recover them from the input text instead.
+        if isinstance(self.vectorizer, Pipeline):
+            self.feature_names = None
+            hasher = self.vectorizer.named_steps['hashing']
+            self._vectorizer_stop_words = hasher.get_stop_words() or frozenset()
+            # Buckets no training document hit carry the maximum idf
+            idf = get_idf_step(self.vectorizer).idf_
+            self._unseen_buckets = idf >= idf.max()
+        else:
+            self.feature_names = self.vectorizer.get_feature_names_out()
+            self._vectorizer_stop_words = self.vectorizer.get_stop_words() or frozenset()
+            self._unseen_buckets = None
+
+    def term_index(self, term):
+        """Feature column of an analyzed term, or None if the model ignores it"""
+        if self._unseen_buckets is None:
+            return self.vectorizer.vocabulary_.get(term)
+        return abs(murmurhash3_32(term, seed=0)) % len(self._unseen_buckets)
+
+    def _term_lookup(self, vectorizer):
+        """term_index bound to one vectorizer"""
+        if not isinstance(vectorizer, Pipeline):
+            return vectorizer.vocabulary_.get
+        n_features = vectorizer.named_steps['hashing'].n_features
+        return lambda term: abs(murmurhash3_32(term, seed=0)) % n_features
+
+    def term_weights(self):
+        """
+        The linear model rewritten over raw term counts, for scoring text
+        incrementally: (term_index, coef * idf, idf ** 2, intercept), where
+        term_index maps an analyzed term to its column (or None) and the
+        decision value of counts c is (c . coef_idf) / sqrt(c^2 . idf_sq)
+        + intercept. All four come from the same installed pipeline, so a
+        caller holding them never mixes two models. Computed once per
+        loaded model.
+        """
+        if self._term_weights is None:
+            pipeline = self.pipeline
+            vectorizer = pipeline.named_steps['tfidf']
+            model = pipeline.named_steps['classifier']
+            idf = get_idf_step(vectorizer).idf_.astype(np.float64)
+            coef = model.coef_[0].astype(np.float64)
+            self._term_weights = (self._term_lookup(vectorizer), coef * idf, idf ** 2,
+                                  float(model.intercept_[0]))
+        return self._term_weights
+
+    def analyze(self, text, tier="full"):
+        """
+        Tokenize an article for the loaded model. Returns (tokens, document):
+        the final tokens and what the vectorizer expects as input, which is
+        the token list itself for fused models and the preprocessed string
+        for older artifacts. tier is the preprocessing tier to use.
+        """
+        if self.fused:
+            tokens = tokenize_text(text, tier, self.lemma_table)
+            return tokens, tokens
+
+        processed_text = preprocess_text(text, tier, self.lemma_table)
+        return processed_text.split(), processed_text
+
+    def count_oov(self, tokens):
+        """
+        Count preprocessed tokens the model never saw during training
+        """
+        tokens = [token for token in tokens if token not in self._vectorizer_stop_words]
+        if self._unseen_buckets is None:
+            vocabulary = self.vectorizer.vocabulary_
+            return sum(1 for token in tokens if token not in vocabulary)
+
+        n_features = len(self._unseen_buckets)
+        return int(sum(
+            self._unseen_buckets[abs(murmurhash3_32(token, seed=0)) % n_features]
+            for token in tokens))
+
+    def _observe(self, tokens, prediction_label, probabilities, tier="full"):
+        """
+        Feed a scored article to the drift monitor, if one is attached.
+        Degraded tiers are left out: unlemmatized tokens would read as drift.
+        """
+        if self.monitor is not None and tier == "full":
+            self.monitor.observe(tokens, self.count_oov(tokens), prediction_label, probabilities,
+                                 model_version=self.model_version)
+
+    def _compute_model_version(self):
+        """
+        Short stable identifier of the loaded model and serving precision
+        """
+        key = "|".join([
+            str(self.model_info.get('trained_at', '')),
+            str(self.model_info.get('model_type', '')),
+            self.precision,
+        ])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+    def _feature_terms(self, indices, document):
+        """
+        Map feature indices of one transformed article back to terms
+        """
+        if self.feature_names is not None:
+            return [str(self.feature_names[index]) for index in indices]
+
+        # Re-hash the article's own n-grams to find which terms landed in
+        # each bucket; colliding terms are reported together
+        hasher = self.vectorizer.named_steps['hashing']
+        buckets = {}
+        for term in set(hasher.build_analyzer()(document)):
+            index = abs(murmurhash3_32(term, seed=0)) % hasher.n_features
+            buckets.setdefault(index, []).append(term)
+        return [' | '.join(sorted(buckets.get(index, ['?']))) for index in indices]
+
     def predict(self, text):
         """
         Predict if a news article is real or fake
         """
+        return self.predict_with_length(text)[:3]
+
+    def predict_with_length(self, text, should_stop=None, tier="full"):
+        """
+        Predict an article and also return its token count, so callers don't
+        preprocess the text a second time to report it. should_stop is
+        checked after preprocessing; when it returns True the prediction is
+        abandoned with PredictionCancelled.
+        """
+        return self.predict_with_features(text, should_stop=should_stop, tier=tier)[:4]
+
+    def predict_with_features(self, text, should_stop=None, tier="full"):
+        """
+        predict_with_length that also returns the article's TF-IDF row
+        (None for empty text), for callers that index the vectors
+        """
         try:
             if not self.pipeline:
                 raise ValueError("Model not trained or loaded")
 
             # Preprocess text
-            processed_text = preprocess_text(text)
+            tokens, document = self.analyze(text, tier)
+            _check_cancelled(should_stop)
 
-            if not processed_text:
+            if not tokens:
                 # Default prediction for empty text
-                return "real", 0.5, [0.5, 0.5]
+                return "real", 0.5, [0.5, 0.5], 0, None
 
-            # Make prediction
-            prediction = self.pipeline.predict([processed_text])[0]
-            probabilities = self.pipeline.predict_proba([processed_text])[0]
+            # Make prediction from a single vectorizer and classifier pass
+            features = self.vectorizer.transform([document])
+            probabilities = self.model.predict_proba(features)[0]
+            prediction = self.model.classes_[np.argmax(probabilities)]
 
             # Convert prediction to label
             prediction_label = "fake" if prediction == 0 else "real"
             confidence = float(max(probabilities))
+            self._observe(tokens, prediction_label, probabilities, tier)
 
-            return prediction_label, confidence, [float(prob) for prob in probabilities]
+            return (prediction_label, confidence,
+                    [float(prob) for prob in probabilities], len(tokens), features)
 
+        except PredictionCancelled:
+            raise
         except Exception as e:
             logger.error(f"Error during prediction: {str(e)}")
             raise
 
+    def vectorize(self, text, tier="full"):
+        """TF-IDF row of one article, or None when nothing survives preprocessing"""
+        if not self.pipeline:
+            raise ValueError("Model not trained or loaded")
+
+        tokens, document = self.analyze(text, tier)
+        if not tokens:
+            return None
+        return self.vectorizer.transform([document])
+
+    def predict_batch(self, texts, should_stop=None, tier="full"):
+        """
+        Predict a batch of articles with a single vectorizer and
+        classifier pass. Returns a list of (label, confidence, probabilities).
+        """
+        labels, probabilities = self.predict_batch_arrays(
+            texts, should_stop=should_stop, tier=tier)
+        return [
+            (label, float(max(probs)), [float(prob) for prob in probs])
+            for label, probs in zip(labels, probabilities)
+        ]
+
+    def predict_batch_arrays(self, texts, should_stop=None, tier="full"):
+        """
+        Columnar form of predict_batch: an array of labels and an
+        (n, 2) array of fake/real probabilities, without per-row tuples.
+        should_stop is checked after each article's preprocessing.
+        """
+        try:
+            if not self.pipeline:
+                raise ValueError("Model not trained or loaded")
+
+            analyzed = []
+            for text in texts:
+                analyzed.append(self.analyze(text, tier))
+                _check_cancelled(should_stop)
+            labels = np.full(len(analyzed), "real", dtype=object)
+            probabilities = np.full((len(analyzed), 2), 0.5)
+
+            # Only score non-empty texts; empty ones keep the default prediction
+            scored = [i for i, (tokens, _) in enumerate(analyzed) if tokens]
+            if scored:
+                scored_probabilities = self.pipeline.predict_proba(
+                    [analyzed[i][1] for i in scored])
+                classes = self.model.classes_[np.argmax(scored_probabilities, axis=1)]
+                probabilities[scored] = scored_probabilities
+                labels[scored] = np.where(classes == 0, "fake", "real")
+
+                for i, probs in zip(scored, scored_probabilities):
+                    self._observe(analyzed[i][0], labels[i], probs, tier)
+
+            return labels, probabilities
+
+        except PredictionCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Error during batch prediction: {str(e)}")
+            raise
+
+    def explain(self, text, top_k=10, should_stop=None, tier="full"):
+        """
+        Explain a prediction by listing the terms that push the article
+        towards fake or real
+        """
+        try:
+            if not self.pipeline:
+                raise ValueError("Model not trained or loaded")
+
+            # Preprocess text
+            tokens, document = self.analyze(text, tier)
+            _check_cancelled(should_stop)
+
+            if not tokens:
+                # Default explanation for empty text
+                return "real", 0.5, [0.5, 0.5], [], []
+
+            # Vectorize once and reuse the sparse row for scoring and weights
+            features = self.vectorizer.transform([document])
+            probabilities = self.model.predict_proba(features)[0]
+
+            # Contribution of each present term to the decision function;
+            # positive values favour class 1 (real), negative class 0 (fake)
+            row = features.tocsr()
+            contributions = row.data * self.model.coef_[0][row.indices]
+            order = np.argsort(contributions)
+
+            fake_order = [i for i in order[:top_k] if contributions[i] < 0]
+            real_order = [i for i in order[::-1][:top_k] if contributions[i] > 0]
+            terms = self._feature_terms(
+                row.indices[fake_order + real_order], document)
+
+            towards_fake = [
+                {'term': term, 'weight': float(contributions[i])}
+                for term, i in zip(terms[:len(fake_order)], fake_order)
+            ]
+            towards_real = [
+                {'term': term, 'weight': float(contributions[i])}
+                for term, i in zip(terms[len(fake_order):], real_order)
+            ]
+
+            prediction = self.model.classes_[np.argmax(probabilities)]
+            prediction_label = "fake" if prediction == 0 else "real"
+            confidence = float(max(probabilities))
+
+            return (prediction_label, confidence,
+                    [float(prob) for prob in probabilities],
+                    towards_fake, towards_real)
+
+        except PredictionCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Error during explanation: {str(e)}")
+            raise
+
+    def warm_up(self, rounds=3):
+        """
+        Load the NLTK corpora and run representative predictions so the
+        first real request doesn't pay for lazy loading or first-call overhead
+        """
+        start = time.perf_counter()
+
+        get_nlp_resources()
+        word_tokenize("warm up the tokenizer")
+
+        if self.pipeline:
+            for _ in range(rounds):
+                for text in WARMUP_ARTICLES:
+                    self.predict(text)
+                self.predict_batch(WARMUP_ARTICLES)
+                self.explain(WARMUP_ARTICLES[0])
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Warm-up completed in {elapsed:.2f}s")
+        return elapsed
+
     def get_model_info(self):
         """
         Get information about the current model
@@ -0,0 +1,180 @@
+import heapq
+import random
+import threading
+
+import numpy as np
+
+# Mersenne prime used for the count-min hash family
+_PRIME = (1 << 31) - 1
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency sketch. Estimates never undercount; overcounts are
+    bounded by the total count divided by the width with high probability.
+    """
+
+    def __init__(self, width=2048, depth=4, seed=42):
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._a = rng.integers(1, _PRIME, size=depth, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, size=depth, dtype=np.int64)
+        self._rows = np.arange(depth)[:, None]
+
+    def _columns(self, items):
+        # 32-bit item hashes keep a * h below 2**63
+        hashes = np.fromiter((hash(item) & 0xFFFFFFFF for item in items),
+                             dtype=np.int64, count=len(items))
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME) % self.width
+
+    def add_many(self, items, counts):
+        """Add counts for a list of items in one vectorized update"""
+        if not items:
+            return
+        columns = self._columns(items)
+        np.add.at(self.table, (np.broadcast_to(self._rows, columns.shape), columns),
+                  np.broadcast_to(np.asarray(counts, dtype=np.int64), columns.shape))
+
+    def estimate_many(self, items):
+        """Estimated counts for a list of items"""
+        if not items:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(items)
+        return self.table[self._rows, columns].min(axis=0)
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample of a stream of values (Algorithm R)"""
+
+    def __init__(self, capacity=1024, seed=42):
+        self.capacity = capacity
+        self.values = []
+        self.seen = 0
+        self._rng = random.Random(seed)
+
+    def add(self, value):
+        self.seen += 1
+        if len(self.values) < self.capacity:
+            self.values.append(value)
+        else:
+            slot = self._rng.randrange(self.seen)
+            if slot < self.capacity:
+                self.values[slot] = value
+
+    def quantiles(self, qs=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        if not self.values:
+            return {}
+        points = np.quantile(np.asarray(self.values), qs)
+        return {f"p{int(q * 100)}": round(float(point), 4) for q, point in zip(qs, points)}
+
+
+class DriftMonitor:
+    """
+    Constant-memory view of live traffic for drift detection.
+
+    Tracks the out-of-vocabulary token rate, the prediction and confidence
+    distribution, and heavy-hitter terms. Terms are counted in a count-min
+    sketch and the top candidates are kept in a bounded dict, so memory does
+    not grow with traffic.
+    """
+
+    def __init__(self, sketch_width=2048, sketch_depth=4, top_k=25,
+                 reservoir_size=1024, histogram_bins=10, ewma_alpha=0.05):
+        self.top_k = top_k
+        self.ewma_alpha = ewma_alpha
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.reservoir_size = reservoir_size
+        self.histogram_edges = np.linspace(0.0, 1.0, histogram_bins + 1)
+
+        self._lock = threading.Lock()
+        self._candidate_capacity = top_k * 4
+        self._reset(None)
+
+    def _reset(self, model_version):
+        self.sketch = CountMinSketch(width=self.sketch_width, depth=self.sketch_depth)
+        self.confidences = ReservoirSample(capacity=self.reservoir_size)
+        self.probability_histogram = np.zeros(len(self.histogram_edges) - 1, dtype=np.int64)
+        self._candidates = {}
+        self.articles = 0
+        self.tokens = 0
+        self.oov_tokens = 0
+        self.recent_oov_rate = None
+        self.predictions = {"fake": 0, "real": 0}
+        self.model_version = model_version
+
+    def observe(self, tokens, oov_count, prediction, probabilities, model_version=None):
+        """Record one scored article"""
+        unique_terms = {}
+        for token in tokens:
+            unique_terms[token] = unique_terms.get(token, 0) + 1
+        terms = list(unique_terms)
+
+        with self._lock:
+            if model_version != self.model_version:
+                self._reset(model_version)
+
+            self.articles += 1
+            self.tokens += len(tokens)
+            self.oov_tokens += oov_count
+            if tokens:
+                rate = oov_count / len(tokens)
+                self.recent_oov_rate = rate if self.recent_oov_rate is None else (
+                    (1 - self.ewma_alpha) * self.recent_oov_rate + self.ewma_alpha * rate)
+
+            self.predictions[prediction] = self.predictions.get(prediction, 0) + 1
+            self.confidences.add(float(max(probabilities)))
+            bin_index = min(np.searchsorted(self.histogram_edges, probabilities[1], side='right') - 1,
+                            len(self.probability_histogram) - 1)
+            self.probability_histogram[max(bin_index, 0)] += 1
+
+            # Heavy hitters: refresh estimates for this article's terms and
+            # keep only the strongest candidates
+            self.sketch.add_many(terms, [unique_terms[term] for term in terms])
+            for term, estimate in zip(terms, self.sketch.estimate_many(terms)):
+                self._candidates[term] = int(estimate)
+            if len(self._candidates) > self._candidate_capacity:
+                self._candidates = dict(heapq.nlargest(
+                    self._candidate_capacity, self._candidates.items(), key=lambda item: item[1]))
+
+    def snapshot(self, vocabulary=None, model_version=None):
+        """
+        Current monitoring state. With a vocabulary, heavy hitters are marked
+        as known or unseen in training.
+        """
+        with self._lock:
+            if model_version is not None and model_version != self.model_version:
+                self._reset(model_version)
+            heavy_hitters = heapq.nlargest(
+                self.top_k, self._candidates.items(), key=lambda item: item[1])
+            return {
+                "model_version": self.model_version,
+                "articles": self.articles,
+                "tokens": self.tokens,
+                "oov_rate": round(self.oov_tokens / self.tokens, 4) if self.tokens else None,
+                "recent_oov_rate": (round(self.recent_oov_rate, 4)
+                                    if self.recent_oov_rate is not None else None),
+                "predictions": dict(self.predictions),
+                "confidence_quantiles": self.confidences.quantiles(),
+                "probability_real_histogram": {
+                    f"{low:.1f}-{high:.1f}": int(count)
+                    for low, high, count in zip(self.histogram_edges[:-1],
+                                                self.histogram_edges[1:],
+                                                self.probability_histogram)
+                },
+                "heavy_hitters": [
+                    {
+                        "term": term,
+                        "estimated_count": count,
+                        **({"in_vocabulary": term in vocabulary} if vocabulary is not None else {}),
+                    }
+                    for term, count in heavy_hitters
+                ],
+                "memory": {
+                    "sketch_bytes": int(self.sketch.table.nbytes),
+                    "reservoir_size": len(self.confidences.values),
+                    "heavy_hitter_candidates": len(self._candidates),
+                },
+            }
@@ -0,0 +1,146 @@
+import time
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import normalize
+
+from ml_pipeline import build_hashing_vectorizer, tokenize_text
+
+logger = logging.getLogger(__name__)
+
+
+def shard_indices(n_samples, n_shards):
+    """Split sample positions into n_shards interleaved shards"""
+    return [np.arange(shard, n_samples, n_shards) for shard in range(n_shards)]
+
+
+def _preprocess_shard(texts, count_words=False):
+    """
+    Worker: tokenize one shard with the fused NLTK preprocessing. With
+    count_words, also returns a Counter of the shard's surface words.
+    """
+    if not count_words:
+        return [tokenize_text(text) for text in texts]
+    word_counts = Counter()
+    return [tokenize_text(text, word_counts=word_counts) for text in texts], word_counts
+
+
+def _hash_counts(texts, n_features):
+    """Hash a shard into raw term counts in the shared feature space"""
+    hasher = build_hashing_vectorizer(n_features=n_features).named_steps['hashing']
+    return hasher.transform(texts)
+
+
+def _shard_document_frequencies(texts, n_features):
+    """Worker: document frequency of every hashed feature in one shard"""
+    counts = _hash_counts(texts, n_features)
+    return np.bincount(counts.indices, minlength=n_features), counts.shape[0]
+
+
+def _fit_shard(texts, labels, idf, classifier_params):
+    """Worker: vectorize one shard with the global idf and fit a classifier on it"""
+    features = _hash_counts(texts, len(idf))
+    features.data *= idf[features.indices]
+    features = normalize(features, norm='l2', copy=False)
+
+    model = LogisticRegression(**classifier_params)
+    model.fit(features, labels)
+    return model.coef_, model.intercept_, len(labels)
+
+
+def parallel_preprocess(texts, executor, n_workers, word_counts=None):
+    """
+    Preprocess texts across the pool, preserving order. word_counts, a
+    Counter, is updated with the surface words the workers counted.
+    """
+    texts = list(texts)
+    shards = shard_indices(len(texts), n_workers)
+    processed = [None] * len(texts)
+    count_words = word_counts is not None
+
+    results = executor.map(_preprocess_shard, [[texts[i] for i in shard] for shard in shards],
+                           [count_words] * len(shards))
+    for shard, shard_result in zip(shards, results):
+        if count_words:
+            shard_result, shard_counts = shard_result
+            word_counts.update(shard_counts)
+        for i, text in zip(shard, shard_result):
+            processed[i] = text
+
+    return processed
+
+
+def fit_parallel(texts, labels, executor, n_workers, classifier_params, n_features=2 ** 18):
+    """
+    Data-parallel fit of the hashed TF-IDF + logistic regression pipeline.
+
+    Each worker hashes its shard into the shared feature space and reports
+    document frequencies; the summed frequencies give one global idf vector.
+    Workers then fit a classifier on their own shard and the coefficients are
+    averaged, weighted by shard size, into a single servable model.
+    Returns (vectorizer, model, timings).
+    """
+    texts = list(texts)
+    labels = np.asarray(labels)
+    shards = shard_indices(len(texts), n_workers)
+    shard_texts = [[texts[i] for i in shard] for shard in shards]
+    shard_labels = [labels[shard] for shard in shards]
+
+    # Every shard needs both classes to fit its own classifier
+    for shard_label in shard_labels:
+        if len(np.unique(shard_label)) < 2:
+            raise ValueError("Each training shard must contain both classes; "
+                             "use fewer workers for this corpus size")
+
+    timings = {}
+
+    # Pass 1: global idf from per-shard document frequencies
+    start = time.perf_counter()
+    document_frequency = np.zeros(n_features, dtype=np.int64)
+    n_documents = 0
+    for shard_df, shard_size in executor.map(
+            _shard_document_frequencies, shard_texts, [n_features] * n_workers):
+        document_frequency += shard_df
+        n_documents += shard_size
+    # Same smoothed idf as TfidfTransformer(smooth_idf=True)
+    idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1.0
+    timings['idf_seconds'] = time.perf_counter() - start
+
+    # Pass 2: fit one classifier per shard, then average the coefficients
+    start = time.perf_counter()
+    coefs = []
+    intercepts = []
+    weights = []
+    for coef, intercept, shard_size in executor.map(
+            _fit_shard, shard_texts, shard_labels, [idf] * n_workers,
+            [classifier_params] * n_workers):
+        coefs.append(coef)
+        intercepts.append(intercept)
+        weights.append(shard_size)
+    timings['fit_seconds'] = time.perf_counter() - start
+
+    weights = np.asarray(weights, dtype=np.float64) / sum(weights)
+
+    # Assemble a servable pipeline from the merged parameters
+    vectorizer = build_hashing_vectorizer(n_features=n_features)
+    idf_step = vectorizer.named_steps['idf']
+    idf_step.idf_ = idf
+    idf_step.n_features_in_ = n_features
+
+    model = LogisticRegression(**classifier_params)
+    model.classes_ = np.unique(labels)
+    model.coef_ = np.average(np.stack(coefs), axis=0, weights=weights)
+    model.intercept_ = np.average(np.stack(intercepts), axis=0, weights=weights)
+    model.n_features_in_ = n_features
+    model.n_iter_ = np.zeros(1, dtype=np.int32)
+
+    return vectorizer, model, timings
+
+
+def create_executor(n_workers):
+    """Process pool used for one parallel training run"""
+    logger.info(f"Starting training pool with {n_workers} workers")
+    return ProcessPoolExecutor(max_workers=n_workers)
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_MB = 1024 * 1024
+
+
+def current_rss_bytes():
+    """Resident set size of this process, where the platform exposes it"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def max_rss_bytes():
+    """High-water mark of the resident set size of this process"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _mb(value):
+    return round(value / _MB, 2) if value is not None else None
+
+
+class _RssSampler:
+    """Tracks the highest RSS seen from a background thread until stopped"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.peak = current_rss_bytes() or 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes() or 0)
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return max(self.peak, current_rss_bytes() or 0)
+
+
+class StageProfiler:
+    """
+    Records wall time and memory of the named stages of a run.
+
+    With trace_memory, tracemalloc reports the peak Python allocation inside
+    each stage (this slows allocation-heavy stages down). RSS after the stage
+    and the peak RSS during it are recorded where the platform exposes the
+    current RSS. The peak is sampled every rss_interval seconds by a
+    background thread, so spikes shorter than that can be missed. Memory
+    allocated by worker processes is not included in either.
+    """
+
+    def __init__(self, trace_memory=False, rss_interval=0.01):
+        self.trace_memory = trace_memory
+        self.rss_interval = rss_interval
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._owns_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+        sampler = _RssSampler(self.rss_interval) if current_rss_bytes() else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"seconds": round(time.perf_counter() - start, 3)}
+            if tracing:
+                _, traced_peak = tracemalloc.get_traced_memory()
+                record["peak_traced_mb"] = _mb(traced_peak - traced_before)
+            record["rss_mb"] = _mb(current_rss_bytes())
+            record["peak_rss_mb"] = _mb(sampler.stop()) if sampler else None
+            self.stages[name] = record
+
+    def seconds(self, name):
+        return self.stages[name]["seconds"] if name in self.stages else 0.0
+
+    def report(self):
+        return {
+            "stages": dict(self.stages),
+            "total_seconds": round(time.perf_counter() - self._started, 3),
+            "memory_traced": self.trace_memory,
+        }
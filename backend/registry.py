@@ -0,0 +1,148 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from ml_pipeline import NewsClassifier, estimate_model_bytes
+
+logger = logging.getLogger(__name__)
+
+# Model names double as artifact file names
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+
+class ModelNotFound(Exception):
+    """Raised when a named model has no artifact"""
+
+    def __init__(self, name):
+        super().__init__(f"Unknown model: {name}")
+        self.name = name
+
+
+class ModelRegistry:
+    """
+    Named model variants, loaded lazily and kept under an LRU budget.
+
+    A model named "desk_a" is loaded from <models_dir>/desk_a.joblib the
+    first time a request asks for it. Loaded models are kept in LRU order
+    and the least recently used ones are evicted once more than max_models
+    are loaded or their estimated memory exceeds max_bytes. Concurrent
+    requests for a model that is still loading wait for the one load.
+    """
+
+    def __init__(self, models_dir, precision="float64", max_models=4, max_bytes=None):
+        self.models_dir = models_dir
+        self.precision = precision
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._models = OrderedDict()
+        self._loading = {}
+        self._stats = {}
+
+    def artifact_path(self, name):
+        if not _NAME_PATTERN.match(name):
+            raise ModelNotFound(name)
+        return os.path.join(self.models_dir, f"{name}.joblib")
+
+    def available(self):
+        """Names of all models with an artifact in the models directory"""
+        if not os.path.isdir(self.models_dir):
+            return []
+        return sorted(
+            filename[:-len(".joblib")] for filename in os.listdir(self.models_dir)
+            if filename.endswith(".joblib") and _NAME_PATTERN.match(filename[:-len(".joblib")])
+        )
+
+    def get(self, name):
+        """Loaded classifier for a model name, loading it if needed (blocking)"""
+        path = self.artifact_path(name)
+
+        with self._lock:
+            classifier = self._models.get(name)
+            if classifier is not None:
+                self._models.move_to_end(name)
+                self._stat(name)["hits"] += 1
+                return classifier
+
+            loading = self._loading.get(name)
+            if loading is None:
+                loading = self._loading[name] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            # Another request is loading this model; share its result
+            loading.wait()
+            with self._lock:
+                classifier = self._models.get(name)
+                if classifier is not None:
+                    self._stat(name)["hits"] += 1
+                    return classifier
+            return self.get(name)
+
+        try:
+            if not os.path.exists(path):
+                raise ModelNotFound(name)
+
+            start = time.perf_counter()
+            classifier = NewsClassifier(precision=self.precision, model_path=path)
+            classifier.load_model()
+            load_seconds = time.perf_counter() - start
+            model_bytes = estimate_model_bytes(classifier)
+
+            with self._lock:
+                stats = self._stat(name)
+                stats["misses"] += 1
+                stats["loads"] += 1
+                stats["last_load_seconds"] = round(load_seconds, 4)
+                stats["total_load_seconds"] = round(stats["total_load_seconds"] + load_seconds, 4)
+                stats["bytes"] = model_bytes
+                self._models[name] = classifier
+                self._evict()
+
+            logger.info(f"Loaded model '{name}' in {load_seconds:.3f}s")
+            return classifier
+        finally:
+            with self._lock:
+                self._loading.pop(name).set()
+
+    def _evict(self):
+        """Drop least recently used models until the budget holds (lock held)"""
+        while len(self._models) > 1 and (
+                len(self._models) > self.max_models
+                or (self.max_bytes is not None and self._loaded_bytes() > self.max_bytes)):
+            name, _ = self._models.popitem(last=False)
+            self._stats[name]["evictions"] += 1
+            logger.info(f"Evicted model '{name}'")
+
+    def _loaded_bytes(self):
+        return sum(self._stats[name]["bytes"] for name in self._models)
+
+    def _stat(self, name):
+        return self._stats.setdefault(name, {
+            "hits": 0, "misses": 0, "loads": 0, "evictions": 0,
+            "last_load_seconds": None, "total_load_seconds": 0.0, "bytes": 0,
+        })
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+                "loaded_bytes": self._loaded_bytes(),
+                "loaded": list(self._models),
+                "models": {
+                    name: {
+                        **stats,
+                        "loaded": name in self._models,
+                        "model_version": (self._models[name].model_version
+                                          if name in self._models else None),
+                    }
+                    for name, stats in self._stats.items()
+                },
+            }
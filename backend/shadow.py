@@ -0,0 +1,126 @@
+import logging
+import queue
+import random
+import threading
+import time
+
+from monitoring import ReservoirSample
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream for the scoring thread
+_STOP = object()
+
+
+class ShadowEvaluator:
+    """
+    Scores a sample of live traffic with a candidate model beside the
+    serving one.
+
+    offer() runs on the request path and only draws a random number and
+    puts the text on a bounded queue; a background thread scores queued
+    texts with the candidate and aggregates agreement and latency in memory.
+    When the queue is full samples are dropped and counted, so the serving
+    path never waits on the candidate.
+    """
+
+    def __init__(self, candidate, sample_rate=0.1, max_queue=1000, reservoir_size=1024, seed=42):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1: {sample_rate}")
+
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+
+        self._rng = random.Random(seed)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._lock = threading.Lock()
+        self._stats = {"offered": 0, "sampled": 0, "dropped": 0, "scored": 0,
+                       "agreements": 0, "errors": 0}
+        self._confusion = {}
+        self._probability_diff_sum = 0.0
+        self._serving_latency = ReservoirSample(capacity=reservoir_size, seed=seed)
+        self._candidate_latency = ReservoirSample(capacity=reservoir_size, seed=seed)
+
+    def start(self):
+        self._thread.start()
+        logger.info(f"Shadow evaluation of model {self.candidate.model_version} "
+                    f"on {self.sample_rate:.0%} of traffic")
+
+    def offer(self, text, prediction, probabilities, latency_ms):
+        """Maybe queue one served verdict for candidate scoring; never blocks"""
+        with self._lock:
+            self._stats["offered"] += 1
+            if self._rng.random() >= self.sample_rate:
+                return
+            self._stats["sampled"] += 1
+
+        try:
+            self._queue.put_nowait((text, prediction, probabilities[1], latency_ms))
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+
+    def close(self, timeout=5.0):
+        """Stop the scoring thread, discarding samples still queued"""
+        if not self._thread.is_alive():
+            return
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Shadow queue refilled during shutdown; stopping without join")
+            return
+        self._thread.join(timeout=timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            scored = stats["scored"]
+            agreement_rate = stats.pop("agreements") / scored if scored else None
+            return {
+                **stats,
+                "candidate_model_version": self.candidate.model_version,
+                "sample_rate": self.sample_rate,
+                "queue_depth": self._queue.qsize(),
+                "agreement_rate": round(agreement_rate, 4) if agreement_rate is not None else None,
+                "mean_abs_probability_diff": (round(self._probability_diff_sum / scored, 4)
+                                              if scored else None),
+                "verdicts": {f"{serving}->{candidate}": count
+                             for (serving, candidate), count in sorted(self._confusion.items())},
+                "latency_ms": {
+                    "serving": self._serving_latency.quantiles(),
+                    "candidate": self._candidate_latency.quantiles(),
+                },
+            }
+
+    def _run(self):
+        """Scoring thread: run the candidate on queued samples"""
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                break
+
+            text, prediction, probability_real, serving_ms = entry
+            try:
+                start = time.perf_counter()
+                candidate_prediction, _, candidate_probabilities = self.candidate.predict(text)
+                candidate_ms = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                logger.error(f"Error scoring shadow sample: {str(e)}")
+                continue
+
+            key = (prediction, candidate_prediction)
+            with self._lock:
+                self._stats["scored"] += 1
+                self._stats["agreements"] += int(prediction == candidate_prediction)
+                self._confusion[key] = self._confusion.get(key, 0) + 1
+                self._probability_diff_sum += abs(candidate_probabilities[1] - probability_real)
+                self._serving_latency.add(serving_ms)
+                self._candidate_latency.add(candidate_ms)
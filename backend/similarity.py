@@ -0,0 +1,146 @@
+import heapq
+import threading
+from datetime import datetime
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _matrix_bytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+class SimilarityIndex:
+    """
+    Bounded sparse index of recently classified articles for cosine search.
+
+    Rows are the model's L2-normalised TF-IDF vectors, so a dot product is
+    the cosine similarity. New rows collect in a small pending list and are
+    sealed into immutable CSR blocks of block_rows rows. A query multiplies
+    each block by the query vector in turn, so temporary memory stays at
+    one block's scores, and keeps a running top-k across blocks. When the
+    index holds more than max_articles rows or max_bytes of vectors and
+    metadata, whole blocks are dropped oldest first.
+
+    Vectors from different models are not comparable, so adding a row for
+    a new model version clears the index.
+    """
+
+    def __init__(self, max_articles=50000, max_bytes=64 * 1024 * 1024, block_rows=1024,
+                 snippet_chars=200):
+        self.max_articles = max_articles
+        self.max_bytes = max_bytes
+        self.block_rows = block_rows
+        self.snippet_chars = snippet_chars
+
+        self._lock = threading.Lock()
+        self._blocks = []  # (csr matrix, metadata list, bytes)
+        self._pending = []
+        self._pending_meta = []
+        self._pending_bytes = 0
+        self._next_id = 0
+        self._evicted = 0
+        self.model_version = None
+
+    def add(self, vector, model_version, title, content, prediction, confidence):
+        """Index one classified article's TF-IDF row"""
+        row = sp.csr_matrix(vector, dtype=np.float32)
+        meta = {
+            "title": title,
+            "snippet": content[:self.snippet_chars],
+            "prediction": prediction,
+            "confidence": round(float(confidence), 4),
+            "classified_at": datetime.now().isoformat(),
+        }
+
+        with self._lock:
+            if model_version != self.model_version:
+                self._reset(model_version)
+
+            meta["id"] = self._next_id
+            self._next_id += 1
+            self._pending.append(row)
+            self._pending_meta.append(meta)
+            self._pending_bytes += _matrix_bytes(row) + self._metadata_bytes([meta])
+
+            if len(self._pending) >= self.block_rows:
+                self._seal()
+            self._evict()
+
+    def query(self, vector, model_version, top_k=10):
+        """
+        Top-k most similar indexed articles as (similarity, metadata) pairs,
+        best first
+        """
+        query = sp.csr_matrix(vector, dtype=np.float32).T.tocsc()
+
+        with self._lock:
+            if model_version != self.model_version:
+                return []
+            blocks = [(matrix, metas) for matrix, metas, _ in self._blocks]
+            if self._pending:
+                # Pending rows are at most block_rows, so stacking them is cheap
+                blocks.append((sp.vstack(self._pending, format="csr"), list(self._pending_meta)))
+
+        best = []
+        for matrix, metas in blocks:
+            scores = (matrix @ query).toarray().ravel()
+            if len(scores) > top_k:
+                candidates = np.argpartition(scores, -top_k)[-top_k:]
+            else:
+                candidates = np.arange(len(scores))
+            for i in candidates:
+                if scores[i] <= 0:
+                    continue
+                item = (float(scores[i]), metas[i]["id"], metas[i])
+                if len(best) < top_k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+        return [(round(score, 4), meta) for score, _, meta in sorted(best, reverse=True)]
+
+    def _reset(self, model_version):
+        self._blocks = []
+        self._pending = []
+        self._pending_meta = []
+        self._pending_bytes = 0
+        self.model_version = model_version
+
+    def _seal(self):
+        matrix = sp.vstack(self._pending, format="csr")
+        metas = self._pending_meta
+        self._blocks.append((matrix, metas, _matrix_bytes(matrix) + self._metadata_bytes(metas)))
+        self._pending = []
+        self._pending_meta = []
+        self._pending_bytes = 0
+
+    def _metadata_bytes(self, metas):
+        # Rough per-row cost of the metadata dict and its strings
+        return sum(240 + len(meta["title"]) + len(meta["snippet"]) for meta in metas)
+
+    def _rows(self):
+        return sum(matrix.shape[0] for matrix, _, _ in self._blocks) + len(self._pending)
+
+    def _bytes(self):
+        return sum(size for _, _, size in self._blocks) + self._pending_bytes
+
+    def _evict(self):
+        """Drop the oldest blocks until the caps hold (lock held)"""
+        while self._blocks and (self._rows() > self.max_articles
+                                or (self.max_bytes is not None and self._bytes() > self.max_bytes)):
+            matrix, _, _ = self._blocks.pop(0)
+            self._evicted += matrix.shape[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "model_version": self.model_version,
+                "articles": self._rows(),
+                "blocks": len(self._blocks),
+                "pending_rows": len(self._pending),
+                "bytes": self._bytes(),
+                "max_articles": self.max_articles,
+                "max_bytes": self.max_bytes,
+                "evicted_articles": self._evicted,
+            }
@@ -0,0 +1,131 @@
+import math
+import re
+
+from scipy.special import expit
+from sklearn.pipeline import Pipeline
+
+from ml_pipeline import tokenize_text
+
+_LAST_WHITESPACE = re.compile(r'\s(?=\S*\Z)')
+
+
+def _analyzer(vectorizer):
+    if isinstance(vectorizer, Pipeline):
+        vectorizer = vectorizer.named_steps['hashing']
+    return vectorizer.analyzer
+
+
+class StreamingSession:
+    """
+    Running fake/real score of an article that arrives in fragments.
+
+    The served model is linear over l2-normalised TF-IDF, so the decision
+    value only depends on two sums over the term counts: c . (coef * idf)
+    and c^2 . idf^2. Each fragment is tokenized on its own and its n-grams
+    update those sums, so a fragment costs time proportional to its length
+    rather than to all the text received so far. The last n-1 tokens are
+    kept to form n-grams across fragment boundaries.
+
+    Text after the last whitespace of a fragment (a word that may continue
+    in the next one), or from an unclosed '<' (an HTML tag), is held back
+    until more text arrives or the stream is finished. With that, the score
+    after finish() matches classifying the concatenated text in one go.
+
+    Models trained before the fused analyzer cannot be scored this way;
+    their sessions keep the text and re-classify all of it per fragment.
+    """
+
+    def __init__(self, classifier, max_pending_chars=10000):
+        self.classifier = classifier
+        self.model_version = classifier.model_version
+        self.incremental = classifier.fused
+        self.max_pending_chars = max_pending_chars
+
+        self.fragments = 0
+        self.chars = 0
+        self.token_count = 0
+        self._pending = ""
+        self._text = []  # Only kept for non-incremental sessions
+
+        if self.incremental:
+            analyzer = _analyzer(classifier.vectorizer)
+            self._min_n, self._max_n = analyzer.ngram_range
+            # One snapshot of the model, so a later swap cannot mix vocabularies
+            self._term_index, self._coef_idf, self._idf_sq, self._intercept = \
+                classifier.term_weights()
+            self._tail = []
+            self._counts = {}
+            self._dot = 0.0
+            self._sq = 0.0
+
+    def feed(self, fragment, should_stop=None):
+        """Add a fragment; returns (label, confidence, probabilities, token_count)"""
+        self.fragments += 1
+        self.chars += len(fragment)
+
+        if not self.incremental:
+            self._text.append(fragment)
+            return self.classifier.predict_with_length(''.join(self._text), should_stop)
+
+        complete, self._pending = self._split(self._pending + fragment)
+        if complete:
+            self._add(tokenize_text(complete))
+        return self.score()
+
+    def finish(self):
+        """Score the held-back text too; the session can still be fed afterwards"""
+        if self.incremental and self._pending:
+            self._add(tokenize_text(self._pending))
+            self._pending = ""
+        if not self.incremental:
+            return self.classifier.predict_with_length(''.join(self._text))
+        return self.score()
+
+    def _split(self, buffer):
+        """Split off the text that may still change when more arrives"""
+        match = _LAST_WHITESPACE.search(buffer)
+        cut = match.start() if match else 0
+        tag = buffer.rfind('<', 0, cut)
+        if tag > buffer.rfind('>', 0, cut):
+            cut = tag
+        if len(buffer) - cut > self.max_pending_chars:
+            # Nothing will complete this; score it as it is
+            cut = len(buffer)
+        return buffer[:cut], buffer[cut:]
+
+    def _add(self, tokens):
+        if not tokens:
+            return
+        self.token_count += len(tokens)
+
+        # n-grams that end in the new tokens, including those starting in the tail
+        window = self._tail + tokens
+        start = len(self._tail)
+        deltas = {}
+        for n in range(self._min_n, self._max_n + 1):
+            for i in range(max(0, start - n + 1), len(window) - n + 1):
+                index = self._term_index(' '.join(window[i:i + n]))
+                if index is not None:
+                    deltas[index] = deltas.get(index, 0) + 1
+        self._tail = window[len(window) - (self._max_n - 1):] if self._max_n > 1 else []
+
+        for index, delta in deltas.items():
+            count = self._counts.get(index, 0)
+            self._counts[index] = count + delta
+            self._dot += self._coef_idf[index] * delta
+            self._sq += self._idf_sq[index] * ((count + delta) ** 2 - count ** 2)
+
+    def score(self):
+        if not self.token_count:
+            # Same default as the classifier gives empty text
+            return "real", 0.5, [0.5, 0.5], 0
+
+        decision = self._intercept
+        if self._sq > 0:
+            decision += self._dot / math.sqrt(self._sq)
+        probability_real = float(expit(decision))
+        probabilities = [1.0 - probability_real, probability_real]
+
+        # Class 1 is real, as in NewsClassifier.predict
+        prediction = "real" if probability_real > 0.5 else "fake"
+        return prediction, max(probabilities), probabilities, self.token_count
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Analyzer Benchmark for Smart News Classifier
+Compares the original two-pass preprocessing (preprocess_text builds a
+string that TfidfVectorizer tokenizes and filters again) with the fused
+TextAnalyzer that tokenizes, filters and builds n-grams once. Reports
+preprocessing/vectorizing time, per-request latency, accuracy and
+prediction agreement on the same split.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from ml_pipeline import (  # noqa: E402
+    build_tfidf_vectorizer, create_synthetic_dataset, preprocess_text, tokenize_text
+)
+
+
+def legacy_vectorizer():
+    """The vectorizer configuration used before the fused analyzer"""
+    return TfidfVectorizer(
+        max_features=5000,
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.95,
+        stop_words='english'
+    )
+
+
+VARIANTS = {
+    'two_pass': (preprocess_text, legacy_vectorizer),
+    'fused': (tokenize_text, build_tfidf_vectorizer),
+}
+
+
+def run_variant(preprocess, make_vectorizer, train_texts, y_train, test_texts, y_test,
+                latency_texts):
+    start = time.perf_counter()
+    documents = [preprocess(text) for text in train_texts]
+    vectorizer = make_vectorizer()
+    features = vectorizer.fit_transform(documents)
+    vectorize_seconds = time.perf_counter() - start
+
+    pipeline = Pipeline([
+        ('tfidf', vectorizer),
+        ('classifier', LogisticRegression(random_state=42, max_iter=1000, C=1.0).fit(
+            features, y_train)),
+    ])
+
+    start = time.perf_counter()
+    predictions = pipeline.predict([preprocess(text) for text in test_texts])
+    score_seconds = time.perf_counter() - start
+
+    latencies = []
+    for text in latency_texts:
+        start = time.perf_counter()
+        pipeline.predict_proba([preprocess(text)])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return predictions, {
+        'train_vectorize_seconds': round(vectorize_seconds, 3),
+        'test_score_seconds': round(score_seconds, 3),
+        'test_accuracy': float(np.mean(predictions == np.asarray(y_test))),
+        'features_count': len(vectorizer.vocabulary_),
+        'latency_ms': {
+            'p50': float(np.percentile(latencies, 50)),
+            'p95': float(np.percentile(latencies, 95)),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-pass and fused preprocessing")
+    parser.add_argument('--articles', type=int, default=20000,
+                        help='Size of the synthetic training corpus')
+    parser.add_argument('--eval-requests', type=int, default=200,
+                        help='Single-article predictions to time')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Analyzer Benchmark")
+    print("=" * 45)
+
+    df = create_synthetic_dataset(args.articles)
+    texts = (df['title'].fillna('') + ' ' + df['text'].fillna('')).tolist()
+    train_texts, test_texts, y_train, y_test = train_test_split(
+        texts, df['label'], test_size=0.2, random_state=42, stratify=df['label'])
+    latency_texts = test_texts[:args.eval_requests]
+
+    report = {'articles': args.articles, 'results': {}}
+    predictions = {}
+    for name, (preprocess, make_vectorizer) in VARIANTS.items():
+        print(f"\nRunning {name} preprocessing on {args.articles} articles...")
+        predictions[name], result = run_variant(
+            preprocess, make_vectorizer, train_texts, y_train, test_texts, y_test,
+            latency_texts)
+        report['results'][name] = result
+
+        print(f"   Preprocess + fit vectorizer: {result['train_vectorize_seconds']:.2f} s")
+        print(f"   Score test split:            {result['test_score_seconds']:.2f} s")
+        print(f"   Test accuracy:               {result['test_accuracy']:.4f}")
+        print(f"   Features:                    {result['features_count']}")
+        print(f"   Latency p50/p95:             {result['latency_ms']['p50']:.3f} / "
+              f"{result['latency_ms']['p95']:.3f} ms")
+
+    two_pass = report['results']['two_pass']
+    fused = report['results']['fused']
+    report['prediction_agreement'] = float(
+        np.mean(predictions['two_pass'] == predictions['fused']))
+    report['vectorize_time_saved'] = round(
+        1 - fused['train_vectorize_seconds'] / two_pass['train_vectorize_seconds'], 4)
+
+    print(f"\nPrediction agreement:   {report['prediction_agreement']:.4f}")
+    print(f"Vectorize time saved:   {report['vectorize_time_saved']:.1%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Parallel Training Benchmark for Smart News Classifier
+Trains the hashed TF-IDF pipeline with an increasing number of worker
+processes and reports wall time, speedup over the single-process path and
+the accuracy of the averaged model
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from ml_pipeline import NewsClassifier, create_synthetic_dataset  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure data-parallel training speedup")
+    parser.add_argument('--articles', type=int, default=50000,
+                        help='Size of the synthetic training corpus')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16, 32],
+                        help='Worker counts to compare (1 = single-process baseline)')
+    parser.add_argument('--hash-features', type=int, default=2 ** 18)
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Parallel Training Benchmark")
+    print("=" * 45)
+    print(f"CPUs available: {os.cpu_count()}")
+
+    df = create_synthetic_dataset(args.articles)
+    runs = []
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        for n_workers in sorted(set(args.workers)):
+            classifier = NewsClassifier(
+                model_path=os.path.join(model_dir, f"workers_{n_workers}.joblib"))
+
+            start = time.perf_counter()
+            metrics = classifier.train_model(
+                vectorizer_type="hashing", hash_features=args.hash_features,
+                data=df, n_workers=n_workers)
+            total_seconds = time.perf_counter() - start
+
+            runs.append({
+                'workers': n_workers,
+                'total_seconds': round(total_seconds, 3),
+                'preprocess_seconds': metrics['preprocess_seconds'],
+                'fit_seconds': metrics['fit_seconds'],
+                'test_accuracy': metrics['test_accuracy'],
+            })
+
+    baseline = runs[0]['total_seconds']
+    print(f"\n{'workers':>8} {'total s':>10} {'preproc s':>10} {'fit s':>8} "
+          f"{'speedup':>8} {'accuracy':>9}")
+    for run in runs:
+        run['speedup'] = round(baseline / run['total_seconds'], 2)
+        print(f"{run['workers']:>8} {run['total_seconds']:>10.2f} "
+              f"{run['preprocess_seconds']:>10.2f} {run['fit_seconds']:>8.2f} "
+              f"{run['speedup']:>7.2f}x {run['test_accuracy']:>9.4f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'articles': args.articles, 'cpus': os.cpu_count(), 'runs': runs},
+                      f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
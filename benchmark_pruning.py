@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Vocabulary Pruning Benchmark for Smart News Classifier
+Trains the TF-IDF pipeline at several pruning levels and reports the
+trade-off between artifact size, load time, per-request latency and
+accuracy
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from benchmark_vectorizers import measure_latency, measure_load  # noqa: E402
+from ml_pipeline import NewsClassifier, create_synthetic_dataset  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare vocabulary pruning levels")
+    parser.add_argument('--articles', type=int, default=20000,
+                        help='Size of the synthetic training corpus')
+    parser.add_argument('--levels', type=int, nargs='+',
+                        default=[2500, 1000, 500, 250, 100],
+                        help='Feature counts to prune to (the unpruned model is always included)')
+    parser.add_argument('--method', choices=['coef', 'chi2'], default='coef')
+    parser.add_argument('--eval-requests', type=int, default=200,
+                        help='Single-article predictions to time')
+    parser.add_argument('--load-repeats', type=int, default=5)
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Vocabulary Pruning Benchmark")
+    print("=" * 45)
+
+    df = create_synthetic_dataset(args.articles)
+    eval_df = create_synthetic_dataset(args.eval_requests, seed=7)
+    eval_texts = (eval_df['title'] + ' ' + eval_df['text']).tolist()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        for level in [None] + sorted(set(args.levels), reverse=True):
+            name = 'unpruned' if level is None else f"top_{level}"
+            print(f"\nTraining {name} ({args.method}) on {args.articles} articles...")
+
+            model_path = os.path.join(model_dir, f"{name}.joblib")
+            classifier = NewsClassifier(model_path=model_path)
+            metrics = classifier.train_model(
+                data=df, prune_features=level, prune_method=args.method)
+            load_ms, loaded_bytes = measure_load(model_path, args.load_repeats)
+
+            runs.append({
+                'level': name,
+                'features_count': metrics['features_count'],
+                'test_accuracy': metrics['test_accuracy'],
+                'artifact_bytes': os.path.getsize(model_path),
+                'load_ms': load_ms,
+                'loaded_memory_bytes': loaded_bytes,
+                'latency_ms': measure_latency(classifier, eval_texts),
+            })
+
+    print(f"\n{'level':>10} {'features':>9} {'accuracy':>9} {'size KiB':>9} "
+          f"{'load ms':>8} {'mem KiB':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    for run in runs:
+        print(f"{run['level']:>10} {run['features_count']:>9} {run['test_accuracy']:>9.4f} "
+              f"{run['artifact_bytes'] / 1024:>9.1f} {run['load_ms']:>8.2f} "
+              f"{run['loaded_memory_bytes'] / 1024:>8.1f} "
+              f"{run['latency_ms']['p50']:>7.3f} {run['latency_ms']['p95']:>7.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'articles': args.articles, 'method': args.method, 'runs': runs},
+                      f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Training Scalability Benchmark for Smart News Classifier
+Runs the full training path on synthetic corpora of increasing size and
+reports per-stage wall time and memory, feature counts and how each stage
+scales with the corpus
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+STAGES = ['generate', 'load', 'preprocess', 'split', 'vectorize', 'fit', 'lemmas', 'evaluate',
+          'save']
+
+
+def train_at_size(n_articles, vectorizer_type, n_workers, trace_memory):
+    """
+    Generate a corpus and train on it. Runs in a fresh process so the RSS
+    high-water mark belongs to this corpus size alone.
+    """
+    from ml_pipeline import NewsClassifier, create_synthetic_dataset
+    from profiling import StageProfiler, current_rss_bytes, max_rss_bytes
+
+    baseline_rss = current_rss_bytes()
+    profiler = StageProfiler()
+    with profiler.stage('generate'):
+        df = create_synthetic_dataset(n_articles)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        model_path = os.path.join(model_dir, 'scaling.joblib')
+        classifier = NewsClassifier(model_path=model_path)
+        start = time.perf_counter()
+        metrics = classifier.train_model(
+            vectorizer_type=vectorizer_type, data=df, n_workers=n_workers,
+            profile_memory=trace_memory)
+        total_seconds = time.perf_counter() - start
+        artifact_bytes = os.path.getsize(model_path)
+
+    profile = classifier.training_profile
+    stages = {**profiler.stages, **profile['stages']}
+    return {
+        'articles': n_articles,
+        'training_samples': metrics['training_samples'],
+        'features_count': metrics['features_count'],
+        'nonzero_coefficients': int((classifier.model.coef_ != 0).sum()),
+        'test_accuracy': metrics['test_accuracy'],
+        'artifact_bytes': artifact_bytes,
+        'train_seconds': round(total_seconds, 3),
+        'baseline_rss_mb': round(baseline_rss / 2 ** 20, 2) if baseline_rss else None,
+        'peak_rss_mb': round(max_rss_bytes() / 2 ** 20, 2) if max_rss_bytes() else None,
+        'stages': stages,
+    }
+
+
+def scaling_exponents(runs):
+    """
+    Log-log slope of each stage's time between consecutive sizes:
+    ~1 is linear, ~2 quadratic. Stages under 10 ms are too noisy to fit.
+    """
+    exponents = []
+    for small, large in zip(runs, runs[1:]):
+        growth = math.log(large['articles'] / small['articles'])
+        slopes = {}
+        for stage in STAGES + ['train']:
+            if stage == 'train':
+                before, after = small['train_seconds'], large['train_seconds']
+            else:
+                before = small['stages'].get(stage, {}).get('seconds')
+                after = large['stages'].get(stage, {}).get('seconds')
+            if before and after and before >= 0.01:
+                slopes[stage] = round(math.log(after / before) / growth, 2)
+        exponents.append({'from': small['articles'], 'to': large['articles'], 'time': slopes})
+    return exponents
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import numpy
+    import pandas
+    import sklearn
+    return {
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'scikit-learn': sklearn.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how training scales with corpus size")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000, 1000000],
+                        help='Corpus sizes to train on')
+    parser.add_argument('--vectorizer', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Training workers (more than 1 requires --vectorizer hashing)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Add tracemalloc peaks per stage (slows training down)')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    parser.add_argument('--history',
+                        help='Append the report as one JSON line to this file to track it over time')
+    args = parser.parse_args()
+
+    print("Training Scalability Benchmark")
+    print("=" * 45)
+
+    # Each size trains in its own process, so peak RSS is not carried over.
+    # Not a Pool: its workers are daemonic and cannot start training workers.
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    for n_articles in sorted(set(args.sizes)):
+        print(f"\nTraining {args.vectorizer} on {n_articles} articles...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            run = executor.submit(train_at_size, n_articles, args.vectorizer, args.workers,
+                                  args.trace_memory).result()
+        runs.append(run)
+        print(f"  {run['train_seconds']:.2f} s, {run['features_count']} features, "
+              f"peak RSS {run['peak_rss_mb']} MB, accuracy {run['test_accuracy']:.4f}")
+
+    print(f"\n{'articles':>9} {'features':>9} {'train s':>9} "
+          + ' '.join(f"{stage[:8]:>9}" for stage in STAGES) + f" {'peak MB':>9}")
+    for run in runs:
+        seconds = [run['stages'].get(stage, {}).get('seconds') for stage in STAGES]
+        print(f"{run['articles']:>9} {run['features_count']:>9} {run['train_seconds']:>9.2f} "
+              + ' '.join(f"{s:>9.2f}" if s is not None else f"{'-':>9}" for s in seconds)
+              + f" {run['peak_rss_mb'] or 0:>9.1f}")
+
+    exponents = scaling_exponents(runs)
+    if exponents:
+        print("\nTime scaling exponent (1.0 = linear)")
+        print(f"{'sizes':>17} " + ' '.join(f"{stage[:8]:>9}" for stage in STAGES + ['train']))
+        for step in exponents:
+            slopes = [step['time'].get(stage) for stage in STAGES + ['train']]
+            print(f"{step['from']:>8}-{step['to']:<8} "
+                  + ' '.join(f"{s:>9.2f}" if s is not None else f"{'-':>9}" for s in slopes))
+
+    report = {
+        'recorded_at': datetime.now().isoformat(),
+        'vectorizer': args.vectorizer,
+        'workers': args.workers,
+        'memory_traced': args.trace_memory,
+        'environment': environment(),
+        'runs': runs,
+        'scaling': exponents,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(report) + '\n')
+        print(f"Report appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Tier Benchmark for Smart News Classifier
+Scores a held-out corpus with each preprocessing tier the server can fall
+back to under overload and reports the accuracy cost, agreement with the
+full tier and preprocessing time of each. Synthetic words are rarely changed
+by WordNet, so use --data with real labeled articles to see what skipping
+lemmatization costs.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from ml_pipeline import (  # noqa: E402
+    PREPROCESSING_TIERS, NewsClassifier, create_synthetic_dataset, read_training_data
+)
+
+
+def evaluate_tier(classifier, texts, labels, tier):
+    start = time.perf_counter()
+    analyzed = [classifier.analyze(text, tier) for text in texts]
+    preprocess_seconds = time.perf_counter() - start
+
+    probabilities = np.full((len(texts), 2), 0.5)
+    scored = [i for i, (tokens, _) in enumerate(analyzed) if tokens]
+    if scored:
+        probabilities[scored] = classifier.pipeline.predict_proba([analyzed[i][1] for i in scored])
+    predictions = classifier.model.classes_[np.argmax(probabilities, axis=1)]
+    return {
+        'tier': tier,
+        'accuracy': float(np.mean(predictions == labels)),
+        'preprocess_us_per_article': round(preprocess_seconds / len(texts) * 1e6, 1),
+        'predictions': predictions,
+        'probability_real': probabilities[:, 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the accuracy cost of preprocessing tiers")
+    parser.add_argument('--data',
+                        help='Labeled Parquet, SQLite or CSV file (title/text/label) to '
+                             'train and evaluate on instead of synthetic articles')
+    parser.add_argument('--table', default='articles', help='SQLite table of --data')
+    parser.add_argument('--eval-fraction', type=float, default=0.2,
+                        help='Share of --data held out for evaluation')
+    parser.add_argument('--articles', type=int, default=20000,
+                        help='Size of the synthetic training corpus')
+    parser.add_argument('--eval-articles', type=int, default=5000,
+                        help='Size of the synthetic held-out corpus')
+    parser.add_argument('--model', help='Evaluate this artifact instead of training one '
+                                        '(on all of --data, if given)')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Preprocessing Tier Benchmark")
+    print("=" * 45)
+
+    if args.data:
+        data = read_training_data(args.data, table=args.table)
+        if args.model:
+            train_df, eval_df = None, data
+        else:
+            train_df, eval_df = train_test_split(
+                data, test_size=args.eval_fraction, random_state=42, stratify=data['label'])
+    else:
+        train_df = None if args.model else create_synthetic_dataset(args.articles)
+        eval_df = create_synthetic_dataset(args.eval_articles, seed=11)
+
+    # The lookup tier reads the lemma table saved with the model, as a
+    # freshly started server does
+    with tempfile.TemporaryDirectory() as model_dir:
+        if args.model:
+            classifier = NewsClassifier(model_path=args.model)
+            classifier.load_model()
+        else:
+            print(f"Training on {len(train_df)} {'' if args.data else 'synthetic '}articles...")
+            classifier = NewsClassifier(model_path=os.path.join(model_dir, 'tiers.joblib'))
+            classifier.train_model(data=train_df)
+    lemma_table_size = len(classifier.lemma_table)
+
+    texts = (eval_df['title'].fillna('') + ' ' + eval_df['text'].fillna('')).tolist()
+    labels = eval_df['label'].to_numpy()
+
+    results = {tier: evaluate_tier(classifier, texts, labels, tier)
+               for tier in PREPROCESSING_TIERS}
+    full = results['full']
+
+    runs = []
+    for tier in PREPROCESSING_TIERS:
+        result = results[tier]
+        runs.append({
+            'tier': tier,
+            'accuracy': round(result['accuracy'], 4),
+            'accuracy_cost': round(full['accuracy'] - result['accuracy'], 4),
+            'agreement_with_full': round(float(np.mean(result['predictions'] == full['predictions'])), 4),
+            'mean_probability_diff': round(float(np.mean(
+                np.abs(result['probability_real'] - full['probability_real']))), 4),
+            'preprocess_us_per_article': result['preprocess_us_per_article'],
+            'preprocess_speedup': round(full['preprocess_us_per_article']
+                                        / result['preprocess_us_per_article'], 2),
+        })
+
+    print(f"\nLemma table entries: {lemma_table_size}")
+    print(f"\n{'tier':>8} {'accuracy':>9} {'cost':>8} {'agree':>7} {'prob diff':>10} "
+          f"{'us/article':>11} {'speedup':>8}")
+    for run in runs:
+        print(f"{run['tier']:>8} {run['accuracy']:>9.4f} {run['accuracy_cost']:>8.4f} "
+              f"{run['agreement_with_full']:>7.4f} {run['mean_probability_diff']:>10.4f} "
+              f"{run['preprocess_us_per_article']:>11.1f} {run['preprocess_speedup']:>7.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'data': args.data, 'eval_articles': len(texts), 'model': args.model,
+                       'lemma_table_size': lemma_table_size, 'runs': runs}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
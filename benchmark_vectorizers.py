@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Vectorizer Benchmark for Smart News Classifier
+Compares the vocabulary-based TfidfVectorizer pipeline with the stateless
+hashing pipeline on accuracy, artifact size, load time, loaded memory and
+per-request latency
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import joblib
+import numpy as np
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from ml_pipeline import NewsClassifier, create_synthetic_dataset  # noqa: E402
+
+
+def measure_load(model_path, repeats):
+    """Median load time in ms and memory held by the loaded artifact"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        joblib.load(model_path)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    model_data = joblib.load(model_path)
+    loaded_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model_data
+
+    return float(np.median(timings)), loaded_bytes
+
+
+def measure_latency(classifier, texts):
+    """Per-request predict latency percentiles in ms"""
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        classifier.predict(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95)),
+    }
+
+
+def benchmark(vectorizer_type, df, eval_texts, model_dir, hash_features, load_repeats):
+    model_path = os.path.join(model_dir, f"{vectorizer_type}.joblib")
+    classifier = NewsClassifier(model_path=model_path)
+    metrics = classifier.train_model(
+        vectorizer_type=vectorizer_type, hash_features=hash_features, data=df)
+
+    load_ms, loaded_bytes = measure_load(model_path, load_repeats)
+    vocabulary = getattr(classifier.vectorizer, 'vocabulary_', None)
+
+    return {
+        'test_accuracy': metrics['test_accuracy'],
+        'features_count': metrics['features_count'],
+        'vocabulary_entries': len(vocabulary) if vocabulary is not None else 0,
+        'artifact_bytes': os.path.getsize(model_path),
+        'load_ms': load_ms,
+        'loaded_memory_bytes': loaded_bytes,
+        'latency_ms': measure_latency(classifier, eval_texts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TF-IDF and hashing vectorizers")
+    parser.add_argument('--articles', type=int, default=20000,
+                        help='Size of the synthetic training corpus')
+    parser.add_argument('--hash-features', type=int, default=2 ** 18,
+                        help='Number of hashing buckets')
+    parser.add_argument('--eval-requests', type=int, default=200,
+                        help='Single-article predictions to time')
+    parser.add_argument('--load-repeats', type=int, default=5)
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Vectorizer Benchmark")
+    print("=" * 45)
+
+    df = create_synthetic_dataset(args.articles)
+    eval_df = create_synthetic_dataset(args.eval_requests, seed=7)
+    eval_texts = (eval_df['title'] + ' ' + eval_df['text']).tolist()
+
+    report = {'articles': args.articles, 'results': {}}
+    with tempfile.TemporaryDirectory() as model_dir:
+        for vectorizer_type in ("tfidf", "hashing"):
+            print(f"\nTraining {vectorizer_type} pipeline on {args.articles} articles...")
+            result = benchmark(vectorizer_type, df, eval_texts, model_dir,
+                               args.hash_features, args.load_repeats)
+            report['results'][vectorizer_type] = result
+
+            print(f"   Test accuracy:     {result['test_accuracy']:.4f}")
+            print(f"   Features:          {result['features_count']}")
+            print(f"   Vocabulary dict:   {result['vocabulary_entries']} entries")
+            print(f"   Artifact size:     {result['artifact_bytes'] / 1024:.1f} KiB")
+            print(f"   Load time:         {result['load_ms']:.2f} ms")
+            print(f"   Loaded memory:     {result['loaded_memory_bytes'] / 1024:.1f} KiB")
+            print(f"   Latency p50/p95:   {result['latency_ms']['p50']:.3f} / "
+                  f"{result['latency_ms']['p95']:.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness for Smart News Classifier
+Drives the classification endpoints at a target concurrency or request rate
+and reports latency percentiles, throughput and error rates.
+
+Runs against a live server (--url) or, by default, against the FastAPI app
+in-process through an ASGI transport so it works without a network.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from contextlib import asynccontextmanager
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+
+# Per-request client logging would swamp the report
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Realistic article mix: short and long, fake-looking and real-looking
+ARTICLES = [
+    {
+        "title": "Federal Reserve Announces Interest Rate Decision",
+        "content": "The Federal Reserve announced a 0.25% interest rate increase following their monthly meeting. The decision comes amid ongoing concerns about inflation and economic stability."
+    },
+    {
+        "title": "Scientists Discover Water Causes Cancer",
+        "content": "A shocking new study reveals that drinking water causes cancer in 99% of cases. Researchers at a made-up university claim that H2O molecules directly attack healthy cells."
+    },
+    {
+        "title": "City Council Approves Infrastructure Budget",
+        "content": "City council approves budget for infrastructure improvements next fiscal year. " * 20
+    },
+    {
+        "title": "Government Admits Birds Are Surveillance Drones",
+        "content": "Government admits that birds are not real, just surveillance drones. Local man discovers one weird trick that doctors hate."
+    },
+    {
+        "title": "University Publishes Renewable Energy Findings",
+        "content": "University researchers publish findings on renewable energy efficiency. <p>Visit https://example.org for the full report</p> " * 50
+    },
+]
+
+
+class ArticleMix:
+    """
+    Request bodies drawn from a synthetic corpus, so most texts are new to
+    the server like real traffic, plus a few recurring "viral" articles
+    """
+
+    def __init__(self, n_articles=5000, viral_share=0.1, seed=42):
+        sys.path.insert(0, BACKEND_DIR)
+        from ml_pipeline import create_synthetic_dataset
+
+        df = create_synthetic_dataset(n_articles, seed=seed)
+        self.corpus = [{"title": title, "content": text}
+                       for title, text in zip(df['title'], df['text'])]
+        self.viral_share = viral_share
+        self.rng = random.Random(seed)
+
+    def article(self):
+        if self.rng.random() < self.viral_share:
+            return self.rng.choice(ARTICLES)
+        return self.rng.choice(self.corpus)
+
+    def payload(self, endpoint):
+        if endpoint == "/classify/batch":
+            return {"articles": [self.article() for _ in range(16)]}
+        if endpoint == "/similar":
+            return {**self.article(), "top_k": 5}
+        return self.article()
+
+
+def classify_payload(mix):
+    """Request body for single-article endpoints"""
+    return mix.article()
+
+
+def batch_payload(mix, batch_size=32):
+    """Request body for the bulk batch endpoint"""
+    return {"articles": [mix.article() for _ in range(batch_size)]}
+
+
+# Payload builders for the endpoints the harness knows how to drive
+PAYLOAD_BUILDERS = {
+    "/classify": classify_payload,
+    "/explain": classify_payload,
+    "/classify/batch": batch_payload,
+}
+
+
+class LoadStats:
+    """Collects per-request latencies and status codes"""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.started = None
+        self.finished = None
+        self.coalesced_share = None
+
+    def record(self, latency, status):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status == "exception" or status >= 400:
+            self.errors += 1
+
+    def summary(self):
+        total = len(self.latencies)
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies_ms = np.array(self.latencies) * 1000 if total else np.zeros(1)
+        return {
+            "requests": total,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "status_counts": {str(k): v for k, v in self.statuses.items()},
+            "coalesced_share": self.coalesced_share,
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+                "p95": round(float(np.percentile(latencies_ms, 95)), 3),
+                "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+                "max": round(float(latencies_ms.max()), 3),
+            },
+        }
+
+
+@asynccontextmanager
+async def open_client(url=None):
+    """
+    Yield an HTTP client for a live server, or for the in-process app when
+    no URL is given. The in-process app gets its startup/shutdown events run.
+    """
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            yield client
+        return
+
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    from app import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver",
+                                     timeout=60) as client:
+            await wait_until_ready(client)
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+async def wait_until_ready(client, timeout=300):
+    """Poll /ready until the app has loaded and warmed up its model"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        if response.json().get("phase") == "failed":
+            raise RuntimeError(f"Model failed to load: {response.json().get('error')}")
+        await asyncio.sleep(0.1)
+    raise TimeoutError("App did not become ready in time")
+
+
+async def coalescing_counts(client):
+    """Server-side (computations, coalesced) totals, or None when coalescing is off"""
+    try:
+        response = await client.get("/stats")
+        coalescing = response.json().get("coalescing")
+    except (httpx.HTTPError, ValueError):
+        return None
+    if not coalescing:
+        return None
+    return coalescing["computations"], coalescing["coalesced"]
+
+
+async def send_request(client, endpoint, payload, stats, scheduled=None):
+    """
+    Send one request and record its latency and status. Latency counts from
+    `scheduled` when given, so time spent queued before sending is included.
+    """
+    start = time.perf_counter() if scheduled is None else scheduled
+    try:
+        response = await client.post(endpoint, json=payload)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = "exception"
+    stats.record(time.perf_counter() - start, status)
+
+
+async def run_load(client, endpoint="/classify", concurrency=10, rps=None,
+                   duration=None, total_requests=200, mix=None):
+    """
+    Drive an endpoint and return the collected LoadStats.
+
+    Without rps, `concurrency` workers send back-to-back requests (closed
+    loop). With rps, requests are issued on a fixed schedule and at most
+    `concurrency` are in flight at once (open loop). Bodies come from `mix`
+    (an ArticleMix); the share of requests the server answered by coalescing
+    them with an identical one in flight is recorded in the stats.
+    """
+    if endpoint not in PAYLOAD_BUILDERS:
+        raise ValueError(f"Unsupported endpoint: {endpoint}")
+
+    build_payload = PAYLOAD_BUILDERS[endpoint]
+    mix = mix or ArticleMix()
+    before = await coalescing_counts(client)
+    stats = LoadStats()
+    stats.started = time.perf_counter()
+    deadline = stats.started + duration if duration else None
+
+    def more_work(issued):
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return issued < total_requests
+
+    if rps is None:
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            while more_work(issued):
+                issued += 1
+                await send_request(client, endpoint, build_payload(mix), stats)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        in_flight = asyncio.Semaphore(concurrency)
+        tasks = []
+        interval = 1.0 / rps
+        issued = 0
+
+        async def limited(payload, scheduled):
+            async with in_flight:
+                await send_request(client, endpoint, payload, stats, scheduled)
+
+        while more_work(issued):
+            scheduled = stats.started + issued * interval
+            tasks.append(asyncio.create_task(limited(build_payload(mix), scheduled)))
+            issued += 1
+            next_send = stats.started + issued * interval
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+        await asyncio.gather(*tasks)
+
+    stats.finished = time.perf_counter()
+    after = await coalescing_counts(client)
+    if before is not None and after is not None:
+        computations, coalesced = (a - b for a, b in zip(after, before))
+        if computations + coalesced:
+            stats.coalesced_share = round(coalesced / (computations + coalesced), 4)
+    return stats
+
+
+def print_summary(endpoint, summary):
+    """Print a human-readable load test summary"""
+    print(f"\nEndpoint: {endpoint}")
+    print(f"   Requests:    {summary['requests']} in {summary['elapsed_seconds']}s")
+    print(f"   Throughput:  {summary['throughput_rps']} req/s")
+    print(f"   Error rate:  {summary['error_rate']:.2%}")
+    print(f"   Statuses:    {summary['status_counts']}")
+    if summary['coalesced_share'] is not None:
+        print(f"   Coalesced:   {summary['coalesced_share']:.2%}")
+    latency = summary['latency_ms']
+    print(f"   Latency ms:  p50={latency['p50']} p95={latency['p95']} "
+          f"p99={latency['p99']} max={latency['max']}")
+
+
+async def main_async(args):
+    results = {}
+    mix = ArticleMix(n_articles=args.articles, viral_share=args.viral_share, seed=args.seed)
+    async with open_client(args.url) as client:
+        for endpoint in args.endpoint:
+            stats = await run_load(
+                client,
+                endpoint=endpoint,
+                concurrency=args.concurrency,
+                rps=args.rps,
+                duration=args.duration,
+                total_requests=args.requests,
+                mix=mix,
+            )
+            results[endpoint] = stats.summary()
+            print_summary(endpoint, results[endpoint])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the classification API")
+    parser.add_argument('--url', help='Base URL of a running server; omit to test in-process')
+    parser.add_argument('--endpoint', action='append',
+                        choices=sorted(PAYLOAD_BUILDERS),
+                        help='Endpoint to drive (repeatable, default /classify)')
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help='Concurrent workers, or max in-flight requests with --rps')
+    parser.add_argument('--rps', type=float, help='Target request rate (open loop)')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Requests per endpoint when --duration is not set')
+    parser.add_argument('--duration', type=float, help='Seconds to run per endpoint')
+    parser.add_argument('--articles', type=int, default=5000,
+                        help='Synthetic articles to draw request bodies from')
+    parser.add_argument('--viral-share', type=float, default=0.1,
+                        help='Share of requests repeating one of a few fixed articles')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help='Fail if any endpoint exceeds this error rate')
+    parser.add_argument('--output', help='Write the summary as JSON to this path')
+    args = parser.parse_args()
+    args.endpoint = args.endpoint or ["/classify"]
+    output = os.path.abspath(args.output) if args.output else None
+
+    print("Smart News Classifier Load Test")
+    print("=" * 45)
+    print(f"Target: {args.url or 'in-process ASGI app'}")
+
+    results = asyncio.run(main_async(args))
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSummary written to {output}")
+
+    return all(r['error_rate'] <= args.max_error_rate for r in results.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Soak Test Harness for Smart News Classifier
+Drives the in-process app for a long period with a mixed workload and
+periodically samples RSS, the top growing tracemalloc allocation sites and
+latency percentiles. Fails when memory or p99 latency grows past the
+configured thresholds between the end of warm-up and the end of the run.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from load_test import ArticleMix, BACKEND_DIR, LoadStats, open_client, send_request
+
+sys.path.insert(0, BACKEND_DIR)
+
+from profiling import current_rss_bytes  # noqa: E402
+
+# Share of requests per endpoint
+ENDPOINT_MIX = {
+    "/classify": 0.7,
+    "/explain": 0.1,
+    "/similar": 0.1,
+    "/classify/batch": 0.1,
+}
+
+
+def parse_duration(value):
+    """Seconds from '90', '30m' or '4h'"""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def top_allocators(baseline, limit):
+    """Allocation sites that grew the most since the baseline snapshot"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        # Matches _bootstrap and _bootstrap_external (lazy imports, not leaks)
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    stats = snapshot.compare_to(baseline, "lineno") if baseline else snapshot.statistics("lineno")
+    return snapshot, [
+        {
+            "site": str(stat.traceback),
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(getattr(stat, "size_diff", stat.size) / 1024, 1),
+            "count_diff": getattr(stat, "count_diff", stat.count),
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def take_sample(elapsed, window, baseline_snapshot, args):
+    summary = window.summary()
+    sample = {
+        "elapsed_seconds": round(elapsed, 1),
+        "rss_mb": round(current_rss_bytes() / 2 ** 20, 2) if current_rss_bytes() else None,
+        "requests": summary["requests"],
+        "throughput_rps": summary["throughput_rps"],
+        "error_rate": summary["error_rate"],
+        "latency_ms": summary["latency_ms"],
+    }
+    snapshot = None
+    if tracemalloc.is_tracing():
+        traced, _ = tracemalloc.get_traced_memory()
+        sample["traced_mb"] = round(traced / 2 ** 20, 2)
+        snapshot, sample["top_allocators"] = top_allocators(baseline_snapshot, args.top_allocators)
+    return sample, snapshot
+
+
+def median_of(samples, key):
+    values = [key(sample) for sample in samples if key(sample) is not None]
+    return float(np.median(values)) if values else None
+
+
+def evaluate(samples, args):
+    """
+    Compare the first samples after warm-up with the last ones. Medians of
+    a few samples on each side keep one slow window from failing the run.
+    """
+    steady = [sample for sample in samples if sample["elapsed_seconds"] > args.warmup]
+    if len(steady) < 2:
+        return {"failures": ["Not enough samples after warm-up to compare"]}
+
+    span = max(1, min(args.compare_samples, len(steady) // 2))
+    first, last = steady[:span], steady[-span:]
+    result = {
+        "baseline_rss_mb": median_of(first, lambda s: s["rss_mb"]),
+        "final_rss_mb": median_of(last, lambda s: s["rss_mb"]),
+        "baseline_p99_ms": median_of(first, lambda s: s["latency_ms"]["p99"]),
+        "final_p99_ms": median_of(last, lambda s: s["latency_ms"]["p99"]),
+        "error_rate": max(sample["error_rate"] for sample in steady),
+        "failures": [],
+    }
+
+    # Least-squares RSS trend over the steady phase
+    points = [(s["elapsed_seconds"], s["rss_mb"]) for s in steady if s["rss_mb"] is not None]
+    if len(points) >= 2:
+        hours, rss = np.array(points).T
+        result["rss_slope_mb_per_hour"] = round(float(np.polyfit(hours / 3600, rss, 1)[0]), 2)
+
+    if result["baseline_rss_mb"] is not None:
+        growth = result["final_rss_mb"] - result["baseline_rss_mb"]
+        result["rss_growth_mb"] = round(growth, 2)
+        if growth > args.max_rss_growth_mb:
+            result["failures"].append(
+                f"RSS grew by {growth:.1f} MB (limit {args.max_rss_growth_mb} MB)")
+
+    if result["baseline_p99_ms"]:
+        ratio = result["final_p99_ms"] / result["baseline_p99_ms"]
+        result["p99_growth"] = round(ratio, 3)
+        if ratio > args.max_p99_growth:
+            result["failures"].append(
+                f"p99 latency grew {ratio:.2f}x (limit {args.max_p99_growth}x)")
+
+    if result["error_rate"] > args.max_error_rate:
+        result["failures"].append(
+            f"Error rate reached {result['error_rate']:.2%} (limit {args.max_error_rate:.2%})")
+    return result
+
+
+def print_sample(sample):
+    latency = sample["latency_ms"]
+    traced = f" traced={sample['traced_mb']}MB" if "traced_mb" in sample else ""
+    print(f"[{sample['elapsed_seconds']:>8.0f}s] rss={sample['rss_mb']}MB{traced} "
+          f"rps={sample['throughput_rps']} p50={latency['p50']} p99={latency['p99']} "
+          f"errors={sample['error_rate']:.2%}")
+    for allocator in sample.get("top_allocators", [])[:3]:
+        print(f"      {allocator['size_diff_kb']:>+10.1f} KiB  {allocator['site']}")
+
+
+async def soak(args):
+    mix = ArticleMix(n_articles=args.articles, seed=args.seed)
+    endpoints = list(ENDPOINT_MIX)
+    weights = [ENDPOINT_MIX[endpoint] for endpoint in endpoints]
+    rng = random.Random(args.seed)
+
+    samples = []
+    async with open_client() as client:
+        started = time.perf_counter()
+        end = started + args.duration
+        window = LoadStats()
+        window.started = time.perf_counter()
+
+        async def worker():
+            while time.perf_counter() < end:
+                endpoint = rng.choices(endpoints, weights)[0]
+                await send_request(client, endpoint, mix.payload(endpoint), window)
+                if args.think_time:
+                    await asyncio.sleep(args.think_time)
+
+        workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+        baseline_snapshot = None
+        try:
+            while time.perf_counter() < end:
+                await asyncio.sleep(min(args.sample_interval, max(0.0, end - time.perf_counter())))
+                finished, window = window, LoadStats()
+                window.started = finished.finished = time.perf_counter()
+                if not finished.latencies:
+                    continue
+
+                elapsed = time.perf_counter() - started
+                sample, snapshot = await asyncio.to_thread(
+                    take_sample, elapsed, finished, baseline_snapshot, args)
+                # Allocator growth is reported against the end of warm-up
+                if baseline_snapshot is None and elapsed >= args.warmup:
+                    baseline_snapshot = snapshot
+                samples.append(sample)
+                print_sample(sample)
+        finally:
+            await asyncio.gather(*workers)
+
+        stats = (await client.get("/stats")).json()
+    return samples, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the classification API in-process")
+    parser.add_argument('--duration', type=parse_duration, default=parse_duration("4h"),
+                        help="Run time, e.g. 3600, 30m or 4h")
+    parser.add_argument('--warmup', type=parse_duration, default=parse_duration("10m"),
+                        help="Time excluded from the growth baseline")
+    parser.add_argument('--sample-interval', type=parse_duration, default=60.0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="Seconds each worker waits between requests")
+    parser.add_argument('--articles', type=int, default=5000,
+                        help="Size of the synthetic article pool")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-tracemalloc', dest='tracemalloc', action='store_false',
+                        help="Skip allocation tracing (it slows the app down)")
+    parser.add_argument('--top-allocators', type=int, default=10)
+    parser.add_argument('--compare-samples', type=int, default=3,
+                        help="Samples averaged at each end of the steady phase")
+    parser.add_argument('--max-rss-growth-mb', type=float, default=50.0)
+    parser.add_argument('--max-p99-growth', type=float, default=1.5,
+                        help="Allowed ratio of final to baseline p99 latency")
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--output', help='Write samples and verdict as JSON to this path')
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    print("Smart News Classifier Soak Test")
+    print("=" * 45)
+    print(f"Duration {args.duration:.0f}s, warm-up {args.warmup:.0f}s, "
+          f"sampling every {args.sample_interval:.0f}s, concurrency {args.concurrency}")
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    samples, stats = asyncio.run(soak(args))
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    verdict = evaluate(samples, args)
+    print("\nVerdict")
+    for key in ("baseline_rss_mb", "final_rss_mb", "rss_growth_mb", "rss_slope_mb_per_hour",
+                "baseline_p99_ms", "final_p99_ms", "p99_growth", "error_rate"):
+        if key in verdict:
+            print(f"   {key}: {verdict[key]}")
+    for failure in verdict["failures"]:
+        print(f"   FAIL: {failure}")
+    if not verdict["failures"]:
+        print("   PASS")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({
+                "recorded_at": datetime.now().isoformat(),
+                "config": vars(args),
+                "samples": samples,
+                "server_stats": stats,
+                "verdict": verdict,
+            }, f, indent=2)
+        print(f"\nReport written to {output}")
+
+    return not verdict["failures"]
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
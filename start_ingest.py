@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Spool ingestion daemon for Smart News Classifier
+Watches a directory for JSONL files of articles, classifies them in batches
+across worker processes and writes results and done-markers
+"""
+
+import os
+import sys
+import signal
+import logging
+import argparse
+
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+
+from ingest import SpoolIngestor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify JSONL files dropped into a spool directory")
+    parser.add_argument('--spool', default=os.environ.get("NEWS_CLASSIFIER_SPOOL_DIR", "spool"),
+                        help='Directory producers drop *.jsonl files into')
+    parser.add_argument('--output', default=os.environ.get("NEWS_CLASSIFIER_RESULTS_DIR", "results"),
+                        help='Directory for <name>.results.jsonl files and <name>.done markers')
+    parser.add_argument('--model', default=os.path.join(backend_dir, 'models', 'news_classifier.joblib'),
+                        help='Trained model artifact')
+    parser.add_argument('--precision', choices=['float64', 'float32'],
+                        default=os.environ.get("NEWS_CLASSIFIER_PRECISION", "float64"))
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help='Worker processes classifying files')
+    parser.add_argument('--max-in-flight', type=int,
+                        help='Files claimed at once (default: twice the workers)')
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help='Articles per vectorizer and classifier pass')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--settle-seconds', type=float, default=1.0,
+                        help='Minimum age of a file before it is claimed')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='Worker deaths on its own before a file is moved to failed/')
+    parser.add_argument('--report-interval', type=float, default=30.0,
+                        help='Seconds between throughput log lines')
+    parser.add_argument('--once', action='store_true',
+                        help='Exit once the spool is empty instead of watching it')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    ingestor = SpoolIngestor(
+        args.spool, args.output, args.model,
+        precision=args.precision,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval,
+        settle_seconds=args.settle_seconds,
+        max_attempts=args.max_attempts,
+    )
+
+    # Finish the files already claimed, then exit
+    def shutdown(signum, frame):
+        logging.info("Stopping after in-flight files...")
+        ingestor.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print("Smart News Classifier - Spool Ingestion")
+    print("=" * 50)
+    print(f"Spool:   {ingestor.spool_dir}")
+    print(f"Results: {ingestor.output_dir}")
+    print(f"Workers: {ingestor.workers}, max files in flight: {ingestor.max_in_flight}")
+
+    try:
+        report = ingestor.run(once=args.once, report_interval=args.report_interval)
+    except FileNotFoundError as e:
+        print(f"{e}. Start the backend once or retrain to create a model.")
+        return False
+
+    print(f"\nFiles:      {report['files']} ({report['failed_files']} failed)")
+    print(f"Articles:   {report['articles']} ({report['invalid']} invalid lines)")
+    print(f"Throughput: {report['articles_per_second']} articles/s, "
+          f"{report['files_per_second']} files/s")
+    return report['failed_files'] == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -8,8 +8,15 @@ import requests
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 API_BASE_URL = "http://localhost:8000"
+WS_BASE_URL = API_BASE_URL.replace("http", "ws", 1)
+
+SAMPLE_ARTICLE = {
+    "title": "Federal Reserve Announces Interest Rate Decision",
+    "content": "The Federal Reserve announced a 0.25% interest rate increase following their monthly meeting. The decision comes amid ongoing concerns about inflation and economic stability."
+}
 
 
 def test_health_endpoint():
@@ -117,14 +124,220 @@ def test_model_info_endpoint():
         return False
 
 
+def test_ready_endpoint():
+    """Test the readiness probe reports a loaded, warmed-up model"""
+    print("\nTesting ready endpoint...")
+    try:
+        response = requests.get(f"{API_BASE_URL}/ready", timeout=5)
+        data = response.json()
+        if response.status_code == 200 and data.get("ready"):
+            print(f"Ready check passed: phase {data['phase']}, "
+                  f"warm-up {data.get('warmup_seconds')}s")
+            return True
+        print(f"Ready check failed: {response.status_code} {data}")
+        return False
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Ready check failed: {e}")
+        return False
+
+
+def test_batch_endpoint():
+    """Test batch classification returns one result per article"""
+    print("\nTesting batch classification endpoint...")
+    articles = [SAMPLE_ARTICLE, {"title": "Short", "content": "Breaking news"}, {"title": "", "content": ""}]
+    try:
+        response = requests.post(f"{API_BASE_URL}/classify/batch",
+                                 json={"articles": articles}, timeout=30)
+        if response.status_code != 200:
+            print(f"Batch classification failed: {response.status_code} {response.text}")
+            return False
+
+        data = response.json()
+        results = data["results"]
+        if len(results) != len(articles):
+            print(f"Batch classification returned {len(results)} results for {len(articles)} articles")
+            return False
+        for result in results:
+            if abs(result["probability_fake"] + result["probability_real"] - 1) > 1e-6:
+                print(f"Batch probabilities do not sum to 1: {result}")
+                return False
+
+        print(f"Batch classification successful: {[r['prediction'] for r in results]} "
+              f"({data['preprocessing_tier']} preprocessing)")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Batch classification request failed: {e}")
+        return False
+
+
+def test_explain_endpoint():
+    """Test explanations agree with /classify and list weighted terms"""
+    print("\nTesting explain endpoint...")
+    try:
+        explanation = requests.post(f"{API_BASE_URL}/explain",
+                                    json={**SAMPLE_ARTICLE, "top_k": 5}, timeout=30)
+        classification = requests.post(f"{API_BASE_URL}/classify", json=SAMPLE_ARTICLE, timeout=30)
+        if explanation.status_code != 200 or classification.status_code != 200:
+            print(f"Explanation failed: {explanation.status_code} {explanation.text}")
+            return False
+
+        data = explanation.json()
+        terms = data["top_fake_terms"] + data["top_real_terms"]
+        if not terms or len(data["top_fake_terms"]) > 5 or len(data["top_real_terms"]) > 5:
+            print(f"Unexpected explanation terms: {terms}")
+            return False
+        if any(t["weight"] >= 0 for t in data["top_fake_terms"]) \
+                or any(t["weight"] <= 0 for t in data["top_real_terms"]):
+            print("Explanation term weights point the wrong way")
+            return False
+        if data["prediction"] != classification.json()["prediction"]:
+            print("Explanation and classification disagree")
+            return False
+
+        print(f"Explanation successful: {data['prediction'].upper()}, "
+              f"top terms {[t['term'] for t in terms[:3]]}")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Explanation request failed: {e}")
+        return False
+
+
+def test_streaming_endpoint():
+    """Test /ws/classify scores fragments and finishes with the /classify verdict"""
+    print("\nTesting streaming classification endpoint...")
+    try:
+        from websockets.sync.client import connect
+    except ImportError:
+        print("Streaming test needs the websockets package (pip install websockets)")
+        return False
+
+    text = f"{SAMPLE_ARTICLE['title']} {SAMPLE_ARTICLE['content']}"
+    # Fragments that split words, so held-back partial words are exercised
+    fragments = [text[i:i + 7] for i in range(0, len(text), 7)]
+    try:
+        with connect(f"{WS_BASE_URL}/ws/classify", open_timeout=10) as websocket:
+            for i, fragment in enumerate(fragments):
+                websocket.send(json.dumps({"fragment": fragment, "final": i == len(fragments) - 1}))
+                message = json.loads(websocket.recv(timeout=30))
+                if "error" in message:
+                    print(f"Streaming classification failed: {message}")
+                    return False
+        final = message
+
+        # The stream scores "title content" as one text, as /classify does
+        response = requests.post(f"{API_BASE_URL}/classify",
+                                 json={"title": SAMPLE_ARTICLE["title"],
+                                       "content": SAMPLE_ARTICLE["content"]}, timeout=30)
+        data = response.json()
+        if not final["final"] or final["fragments"] != len(fragments):
+            print(f"Streaming session ended unexpectedly: {final}")
+            return False
+        if data["preprocessing_tier"] == "full" \
+                and abs(final["probability_real"] - data["probability_real"]) > 1e-6:
+            print(f"Streamed score {final['probability_real']:.6f} differs from "
+                  f"/classify {data['probability_real']:.6f}")
+            return False
+
+        print(f"Streaming classification successful: {final['prediction'].upper()} after "
+              f"{final['fragments']} fragments (incremental: {final['incremental']})")
+        return True
+    except Exception as e:
+        print(f"Streaming classification failed: {e}")
+        return False
+
+
+def test_coalesced_requests(copies=16):
+    """Test identical concurrent /classify requests share one computation"""
+    print("\nTesting request coalescing...")
+    article = {"title": "Coalescing check", "content": " ".join(
+        f"council budget report {i}" for i in range(2000))}
+    try:
+        before = requests.get(f"{API_BASE_URL}/stats", timeout=5).json()["coalescing"]
+        if before is None:
+            print("Coalescing is disabled on this server; skipped")
+            return True
+
+        def send(_):
+            return requests.post(f"{API_BASE_URL}/classify", json=article, timeout=60).json()
+
+        with ThreadPoolExecutor(max_workers=copies) as pool:
+            verdicts = list(pool.map(send, range(copies)))
+        after = requests.get(f"{API_BASE_URL}/stats", timeout=5).json()["coalescing"]
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        print(f"Coalescing request failed: {e}")
+        return False
+
+    if len({verdict.get("probability_real") for verdict in verdicts}) != 1:
+        print("Coalescing check failed: identical requests got different verdicts")
+        return False
+    computations = after["computations"] - before["computations"]
+    coalesced = after["coalesced"] - before["coalesced"]
+    if computations + coalesced != copies or computations >= copies:
+        print(f"Coalescing check failed: {computations} computations, {coalesced} coalesced")
+        return False
+
+    print(f"Coalescing check passed: {copies} requests, {computations} computations")
+    return True
+
+
+def test_deadline_response():
+    """Test a request that cannot finish within its timeout gets a 504"""
+    print("\nTesting request deadline...")
+    article = {"title": "Deadline check", "content": " ".join(
+        f"council budget report {i}" for i in range(20000))}
+    try:
+        response = requests.post(f"{API_BASE_URL}/classify", json=article,
+                                 headers={"X-Request-Timeout-Ms": "1"}, timeout=60)
+        if response.status_code == 504:
+            print("Deadline check passed: 504 for a 1 ms budget")
+            return True
+        print(f"Deadline check failed: expected 504, got {response.status_code}")
+        return False
+    except requests.exceptions.RequestException as e:
+        print(f"Deadline request failed: {e}")
+        return False
+
+
+def test_overload_response(burst=64):
+    """Test a burst past the bulk queue is shed with 429 and Retry-After"""
+    print("\nTesting admission control under a burst...")
+    articles = [{"title": f"Burst {i}", "content": SAMPLE_ARTICLE["content"] * 4}
+                for i in range(256)]
+
+    def send(_):
+        try:
+            response = requests.post(f"{API_BASE_URL}/classify/batch",
+                                     json={"articles": articles}, timeout=120)
+            return response.status_code, response.headers.get("Retry-After")
+        except requests.exceptions.RequestException:
+            return "exception", None
+
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        outcomes = list(pool.map(send, range(burst)))
+
+    statuses = {}
+    for status, _ in outcomes:
+        statuses[status] = statuses.get(status, 0) + 1
+    rejected = [retry_after for status, retry_after in outcomes if status == 429]
+    if not rejected or 200 not in statuses or set(statuses) - {200, 429}:
+        print(f"Overload check failed: statuses {statuses}")
+        return False
+    if not all(retry_after and retry_after.isdigit() for retry_after in rejected):
+        print("Overload check failed: 429 without a Retry-After header")
+        return False
+
+    print(f"Overload check passed: statuses {statuses}")
+    return True
+
+
 def wait_for_server():
-    """Wait for the server to be ready"""
+    """Wait until the server has loaded and warmed up its model"""
     print("Waiting for server to be ready...")
     max_attempts = 30
 
     for attempt in range(max_attempts):
         try:
-            response = requests.get(f"{API_BASE_URL}/health", timeout=2)
+            response = requests.get(f"{API_BASE_URL}/ready", timeout=2)
             if response.status_code == 200:
                 print("Server is ready!")
                 return True
@@ -151,18 +364,22 @@ def main():
         print("   cd backend && python app.py")
         sys.exit(1)
 
-    # Run tests
-    tests_passed = 0
-    total_tests = 3
-
-    if test_health_endpoint():
-        tests_passed += 1
-
-    if test_classification_endpoint():
-        tests_passed += 1
-
-    if test_model_info_endpoint():
-        tests_passed += 1
+    # Run tests; overload checks last, since they push the server into
+    # degraded preprocessing for a while
+    tests = [
+        test_health_endpoint,
+        test_ready_endpoint,
+        test_classification_endpoint,
+        test_batch_endpoint,
+        test_explain_endpoint,
+        test_streaming_endpoint,
+        test_model_info_endpoint,
+        test_coalesced_requests,
+        test_deadline_response,
+        test_overload_response,
+    ]
+    total_tests = len(tests)
+    tests_passed = sum(1 for test in tests if test())
 
     # Print results
     print("\n" + "=" * 45)
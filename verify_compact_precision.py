@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compact precision verification for Smart News Classifier
+Compares the float32 serving pipeline against the float64 pipeline on
+prediction agreement, memory footprint and per-request latency
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+# Run from the backend directory so the model path resolves
+invocation_dir = os.getcwd()
+backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.insert(0, backend_dir)
+os.chdir(backend_dir)
+
+from ml_pipeline import NewsClassifier, create_sample_dataset, get_idf_step  # noqa: E402
+
+
+def load_texts(path):
+    """Load articles from a JSONL file with title/content fields, or use the sample dataset"""
+    if path:
+        texts = []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    texts.append(
+                        f"{record.get('title', '')} {record.get('content', record.get('text', ''))}")
+        return texts
+
+    df = create_sample_dataset()
+    return (df['title'] + ' ' + df['text']).tolist()
+
+
+def pipeline_nbytes(pipeline):
+    """Bytes held by the numeric serving arrays (idf weights and coefficients)"""
+    idf_step = get_idf_step(pipeline.named_steps['tfidf'])
+    model = pipeline.named_steps['classifier']
+    return idf_step.idf_.nbytes + model.coef_.nbytes + model.intercept_.nbytes
+
+
+def time_predictions(classifier, texts, repeats):
+    """Return per-request latencies in milliseconds"""
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            classifier.predict(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--texts', help='JSONL file with title/content records')
+    parser.add_argument('--repeats', type=int, default=20,
+                        help='Timing passes over the texts')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    print("Compact Precision Verification")
+    print("=" * 45)
+
+    reference = NewsClassifier(precision="float64")
+    compact = NewsClassifier(precision="float32")
+    if not reference.load_model() or not compact.load_model():
+        print("No trained model found. Train one first via the API or /train")
+        sys.exit(1)
+
+    texts = load_texts(os.path.join(invocation_dir, args.texts) if args.texts else None)
+    processed = [reference.analyze(text)[1] for text in texts]
+
+    # Prediction agreement
+    ref_proba = reference.pipeline.predict_proba(processed)
+    compact_proba = compact.pipeline.predict_proba(processed)
+    agreement = float(np.mean(
+        ref_proba.argmax(axis=1) == compact_proba.argmax(axis=1)))
+    max_abs_diff = float(np.max(np.abs(ref_proba - compact_proba)))
+
+    # Memory of the serving arrays and of a transformed batch
+    ref_matrix = reference.vectorizer.transform(processed)
+    compact_matrix = compact.vectorizer.transform(processed)
+
+    # Latency of the full predict path
+    ref_latency = time_predictions(reference, texts, args.repeats)
+    compact_latency = time_predictions(compact, texts, args.repeats)
+
+    report = {
+        'articles': len(texts),
+        'prediction_agreement': agreement,
+        'max_probability_difference': max_abs_diff,
+        'model_bytes': {
+            'float64': pipeline_nbytes(reference.pipeline),
+            'float32': pipeline_nbytes(compact.pipeline),
+        },
+        'batch_matrix_bytes': {
+            'float64': int(ref_matrix.data.nbytes),
+            'float32': int(compact_matrix.data.nbytes),
+        },
+        'latency_ms': {
+            'float64': {'p50': float(np.percentile(ref_latency, 50)),
+                        'p95': float(np.percentile(ref_latency, 95))},
+            'float32': {'p50': float(np.percentile(compact_latency, 50)),
+                        'p95': float(np.percentile(compact_latency, 95))},
+        },
+    }
+
+    print(f"Articles compared:        {report['articles']}")
+    print(f"Prediction agreement:     {agreement:.2%}")
+    print(f"Max probability diff:     {max_abs_diff:.2e}")
+    print(f"Model arrays (bytes):     {report['model_bytes']['float64']} -> "
+          f"{report['model_bytes']['float32']}")
+    print(f"Batch matrix (bytes):     {report['batch_matrix_bytes']['float64']} -> "
+          f"{report['batch_matrix_bytes']['float32']}")
+    print(f"Latency p50 (ms):         {report['latency_ms']['float64']['p50']:.3f} -> "
+          f"{report['latency_ms']['float32']['p50']:.3f}")
+    print(f"Latency p95 (ms):         {report['latency_ms']['float64']['p95']:.3f} -> "
+          f"{report['latency_ms']['float32']['p95']:.3f}")
+
+    if args.output:
+        with open(os.path.join(invocation_dir, args.output), 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    return agreement == 1.0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)